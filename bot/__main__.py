@@ -1,17 +1,35 @@
 import asyncio
 
 from bot.bot import Bot
+from bot.economy.shop import bot_shop
+from bot.levels.images.generate import prerender_level_icons
+from bot.twitch.subscriptions import import_streamers_json
 
 
 async def main() -> None:
     await bot.load_extensions("bot/cogs")
+    if rendered := await asyncio.to_thread(prerender_level_icons):
+        bot.logger.info(f"Rendered {rendered} level badges into the image cache")  # noqa: G004
     await bot.connect_to_database()
     await bot.database.create_tables()
     bot.logger.info("Database Tables Created")
+    await bot.database.load_caches()
+    if migrated := await bot.database.levels.migrate_guild_tables():
+        bot.logger.info(f"Migrated {migrated} rows from per-guild level tables")  # noqa: G004
+    item_ids = {item.name: item.item_id for item in bot_shop.items}
+    moved, unparsed = await bot.database.economy.migrate_inventory_blobs(item_ids)
+    if moved:
+        bot.logger.info(f"Moved {moved} items from old inventory strings into inventory_items")  # noqa: G004
+    if unparsed:
+        bot.logger.warning(f"Couldn't parse the old inventory of users {unparsed}, left it in bank.inventory")  # noqa: G004
+    if imported := await import_streamers_json(bot.database.twitch):
+        bot.logger.info(f"Imported {imported} Twitch alerts from streamers.json")  # noqa: G004
     await bot.start(bot.settings.discord_bot_token)
 
 
 async def shutdown() -> None:
+    if bot.database is not None:
+        await bot.database.levels.flush_xp()  # don't lose XP that is still buffered
     await bot.close_database_connection()
     await bot.close()
 
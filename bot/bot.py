@@ -1,15 +1,20 @@
 import logging
+from typing import TYPE_CHECKING
 
-import aiosqlite
 import discord
 from discord.ext import commands
 from rich.logging import RichHandler
 
 from bot import utils
 from bot.database.commands import SqliteRepository
+from bot.database.connection import ReadConnectionPool, connect
+from bot.economy.identity_map import EconomyIdentityMap
 from bot.settings import Settings
 from bot.ui import PersistentRoleButton
 
+if TYPE_CHECKING:
+    import aiosqlite
+
 
 def configure_logging() -> None:
     file_handler = logging.FileHandler("botcmds.log", encoding="utf-8")
@@ -53,6 +58,8 @@ class Bot(commands.Bot):
 
         self.database: SqliteRepository | None = None
         self.database_connection: aiosqlite.Connection | None = None
+        self.database_readers: ReadConnectionPool | None = None
+        self.economy_users = EconomyIdentityMap(self)
 
         @self.event
         async def setup_hook() -> None:
@@ -65,11 +72,14 @@ class Bot(commands.Bot):
             self.logger.info("Reaction roles loaded")
 
     async def connect_to_database(self) -> None:
-        self.database_connection = await aiosqlite.connect(self.settings.database_path)
-        self.database = SqliteRepository(self.database_connection)
+        self.database_connection = await connect(self.settings.database_path, self.settings)
+        self.database_readers = await ReadConnectionPool.open(self.settings.database_path, self.settings)
+        self.database = SqliteRepository(self.database_connection, self.database_readers)
         await self.database.initialize()
 
     async def close_database_connection(self) -> None:
+        if self.database_readers is not None:
+            await self.database_readers.close()
         if self.database_connection is not None:
             await self.database_connection.close()
 
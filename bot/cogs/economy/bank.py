@@ -1,11 +1,11 @@
 import asyncio
 import datetime
+import time
 
 import discord
 from discord.ext import commands, tasks
 
 from bot.bot import Bot
-from bot.economy.economy_objects import EconomyUser, Inventory
 
 
 class ErrorEmbed(discord.Embed):
@@ -26,12 +26,24 @@ class Bank(commands.Cog):
 
     @tasks.loop(time=datetime.time(hour=8))  # 6PM AEST in UTC is 8 AM
     async def update_bank(self) -> None:
-        await self.bot.database.economy.do_bank_interest()
+        await self.pay_interest(datetime.datetime.now(datetime.UTC).date().isoformat())
 
     @update_bank.before_loop
     async def before_update_bank(self) -> None:
         while not self.bot.is_ready():
             await asyncio.sleep(1)
+        if (run_date := await self.bot.database.economy.get_unfinished_interest_run()) is not None:
+            await self.pay_interest(run_date)  # the bot stopped part way through a run
+
+    async def pay_interest(self, run_date: str) -> None:
+        start = time.perf_counter()
+        paid = await self.bot.database.economy.do_bank_interest(run_date)
+        self.bot.economy_users.invalidate()  # cached bank balances are out of date now
+        elapsed = time.perf_counter() - start
+        self.bot.logger.info(
+            f"Paid bank interest for {run_date} to {paid} accounts in {elapsed:.2f}s "  # noqa: G004
+            f"({paid / elapsed:,.0f} rows/s)",
+        )
 
     bank = discord.app_commands.Group(name="bank", description="Bank related commands")
 
@@ -39,8 +51,7 @@ class Bank(commands.Cog):
     async def balance(self, interaction: discord.Interaction, member: discord.Member = None) -> None:
         if member is None:
             member = interaction.user
-        balance = await self.bot.database.economy.get_user_bank(member.id)
-        user = EconomyUser(interaction.user.id, balance[0], balance[1], Inventory.from_string(balance[2]), self.bot)
+        user = await self.bot.economy_users.get(member.id)
         embed = discord.Embed(
             title=f"{member.display_name}'s balance",
             description=f"**Wallet**: {user.wallet_balance / 100:.2f} :coin:"
@@ -56,13 +67,13 @@ class Bank(commands.Cog):
         if amount <= 0:
             await interaction.response.send_message(embed=ErrorEmbed("You can't deposit less than 0.01 :coin:!"))
             return
-        balance = await self.bot.database.economy.get_user_bank(interaction.user.id)
-        user = EconomyUser(interaction.user.id, balance[0], balance[1], Inventory.from_string(balance[2]), self.bot)
-        if amount > user.wallet_balance:
-            await interaction.response.send_message(embed=ErrorEmbed("Insufficient funds in your wallet!"))
-            return
-        await user.edit_bank(amount)
-        await user.edit_wallet(-amount)
+        async with self.bot.economy_users.lock(interaction.user.id) as (user,):
+            if amount > user.wallet_balance:
+                await interaction.response.send_message(embed=ErrorEmbed("Insufficient funds in your wallet!"))
+                return
+            async with self.bot.database.economy.unit_of_work() as unit_of_work:
+                await user.edit_bank(amount, unit_of_work)
+                await user.edit_wallet(-amount, unit_of_work)
         await interaction.response.send_message(f"Deposited {amount / 100} :coin: into your bank!")
 
     @bank.command(name="withdraw", description="Withdraw money from your bank into your wallet")
@@ -72,13 +83,13 @@ class Bank(commands.Cog):
         if amount <= 0:
             await interaction.response.send_message(embed=ErrorEmbed("You can't withdraw less than 0.01 :coin:!"))
             return
-        balance = await self.bot.database.economy.get_user_bank(interaction.user.id)
-        user = EconomyUser(interaction.user.id, balance[0], balance[1], Inventory.from_string(balance[2]), self.bot)
-        if amount > user.bank_balance:
-            await interaction.response.send_message(embed=ErrorEmbed("Insufficient funds in your bank!"))
-            return
-        await user.edit_bank(-amount)
-        await user.edit_wallet(amount)
+        async with self.bot.economy_users.lock(interaction.user.id) as (user,):
+            if amount > user.bank_balance:
+                await interaction.response.send_message(embed=ErrorEmbed("Insufficient funds in your bank!"))
+                return
+            async with self.bot.database.economy.unit_of_work() as unit_of_work:
+                await user.edit_bank(-amount, unit_of_work)
+                await user.edit_wallet(amount, unit_of_work)
         await interaction.response.send_message(f"Withdrew {amount / 100} :coin: from your bank!")
 
     @bank.command(name="transfer", description="Transfer money from your wallet to someone else")
@@ -91,21 +102,13 @@ class Bank(commands.Cog):
         if amount <= 0:
             await interaction.response.send_message(embed=ErrorEmbed("You can't transfer less than 0.01 :coin:!"))
             return
-        balance = await self.bot.database.economy.get_user_bank(interaction.user.id)
-        user = EconomyUser(interaction.user.id, balance[0], balance[1], Inventory.from_string(balance[2]), self.bot)
-        if amount > user.wallet_balance:
-            await interaction.response.send_message(embed=ErrorEmbed("Insufficient funds in your wallet!"))
-            return
-        await user.edit_wallet(-amount)
-        updated_balance = await self.bot.database.economy.get_user_bank(member.id)
-        target = EconomyUser(
-            member.id,
-            updated_balance[0],
-            updated_balance[1],
-            Inventory.from_string(updated_balance[2]),
-            self.bot,
-        )
-        await target.edit_wallet(amount)
+        async with self.bot.economy_users.lock(interaction.user.id, member.id) as (user, target):
+            if amount > user.wallet_balance:
+                await interaction.response.send_message(embed=ErrorEmbed("Insufficient funds in your wallet!"))
+                return
+            async with self.bot.database.economy.unit_of_work() as unit_of_work:
+                await user.edit_wallet(-amount, unit_of_work)
+                await target.edit_wallet(amount, unit_of_work)
         await interaction.response.send_message(
             f"Transferred {amount / 100} :coin: from your wallet to {member.mention}!",
         )
@@ -4,7 +4,6 @@ import discord
 from discord.ext import commands
 
 from bot.bot import Bot
-from bot.economy.economy_objects import EconomyUser, Inventory
 
 STEAL_CHANCE = 70  # percentage chance of stealing money
 
@@ -36,14 +35,7 @@ class Crime(commands.Cog):
             )
             return
 
-        target_data = await self.bot.database.economy.get_user_bank(member.id)
-        target = EconomyUser(
-            member.id,
-            target_data[0],
-            target_data[1],
-            Inventory.from_string(target_data[2]),
-            self.bot,
-        )
+        target = await self.bot.economy_users.get(member.id)
         if target.wallet_balance == 0:
             await interaction.response.send_message(
                 embed=discord.Embed(
@@ -54,14 +46,6 @@ class Crime(commands.Cog):
                 ),
             )
             return
-        user_data = await self.bot.database.economy.get_user_bank(interaction.user.id)
-        user = EconomyUser(
-            interaction.user.id,
-            user_data[0],
-            user_data[1],
-            Inventory.from_string(user_data[2]),
-            self.bot,
-        )
 
         if random.randint(1, 100) > STEAL_CHANCE:  # noqa: S311
             await interaction.response.send_message(
@@ -72,9 +56,11 @@ class Crime(commands.Cog):
             )
             return
 
-        steal_amount = random.randint(1, min(100, target.wallet_balance)) * 100  # noqa: S311
-        await target.edit_wallet(-steal_amount)
-        await user.edit_wallet(steal_amount)
+        async with self.bot.economy_users.lock(member.id, interaction.user.id) as (target, user):
+            steal_amount = min(random.randint(1, 100) * 100, target.wallet_balance)  # noqa: S311
+            async with self.bot.database.economy.unit_of_work() as unit_of_work:
+                await target.edit_wallet(-steal_amount, unit_of_work)
+                await user.edit_wallet(steal_amount, unit_of_work)
         await interaction.response.send_message(
             embed=discord.Embed(
                 description=f"You stole {steal_amount / 100:.2f} :coin: from {member.mention}! "
@@ -104,14 +90,7 @@ class Crime(commands.Cog):
             )
             return
 
-        target_data = await self.bot.database.economy.get_user_bank(member.id)
-        target = EconomyUser(
-            member.id,
-            target_data[0],
-            target_data[1],
-            Inventory.from_string(target_data[2]),
-            self.bot,
-        )
+        target = await self.bot.economy_users.get(member.id)
         if target.bank_balance == 0:
             await interaction.response.send_message(
                 embed=discord.Embed(
@@ -121,14 +100,6 @@ class Crime(commands.Cog):
                 ),
             )
             return
-        user_data = await self.bot.database.economy.get_user_bank(interaction.user.id)
-        user = EconomyUser(
-            interaction.user.id,
-            user_data[0],
-            user_data[1],
-            Inventory.from_string(user_data[2]),
-            self.bot,
-        )
 
         if random.randint(1, 100) > STEAL_CHANCE:  # noqa: S311
             await interaction.response.send_message(
@@ -139,13 +110,15 @@ class Crime(commands.Cog):
             )
             return
 
-        steal_amount = random.randint(1, min(100, target.wallet_balance)) * 100  # noqa: S311
-        await target.edit_bank(-steal_amount)
-        await user.edit_wallet(steal_amount)
+        async with self.bot.economy_users.lock(member.id, interaction.user.id) as (target, user):
+            steal_amount = min(random.randint(1, 100) * 100, target.bank_balance)  # noqa: S311
+            async with self.bot.database.economy.unit_of_work() as unit_of_work:
+                await target.edit_bank(-steal_amount, unit_of_work)
+                await user.edit_wallet(steal_amount, unit_of_work)
         await interaction.response.send_message(
             embed=discord.Embed(
                 description=f"You stole {steal_amount / 100:.2f} :coin: from {member.mention}! "
-                f"They now have {target.wallet_balance / 100:.2f} :coin: left in their bank.",
+                f"They now have {target.bank_balance / 100:.2f} :coin: left in their bank.",
                 colour=discord.Colour.dark_orange(),
             ),
         )
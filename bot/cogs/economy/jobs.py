@@ -4,7 +4,6 @@ import discord
 from discord.ext import commands
 
 from bot.bot import Bot
-from bot.economy.economy_objects import EconomyUser, Inventory
 from bot.economy.jobs import get_job_from_str, jobs, unemployed
 from bot.errors import JobDoesNotExistError
 
@@ -75,8 +74,6 @@ class JobCommands(commands.Cog):
     @discord.app_commands.checks.cooldown(1, 15 * 60)  # 15 min cooldown
     async def work(self, interaction: discord.Interaction) -> None:
         """Work at a job"""
-        bank = await self.bot.database.economy.get_user_bank(interaction.user.id)
-        user = EconomyUser(interaction.user.id, bank[0], bank[1], Inventory.from_string(bank[2]), self.bot)
         job = await self.bot.database.economy.get_job(interaction.user.id)
         if job is None or job == unemployed:
             embed = discord.Embed(
@@ -85,15 +82,18 @@ class JobCommands(commands.Cog):
             )
             await interaction.response.send_message(embed=embed)
             return
-        amount_earned = job.salary
-        amount_earned, multiplier = await user.multiply_earnings(amount_earned)
-        await user.edit_wallet(int(amount_earned * 100))
+        async with (
+            self.bot.economy_users.lock(interaction.user.id) as (user,),
+            self.bot.database.economy.unit_of_work() as unit_of_work,
+        ):
+            amount_earned, multiplier = await user.multiply_earnings(job.salary, unit_of_work)
+            await user.edit_wallet(int(amount_earned * 100), unit_of_work)
+            await user.unhappy_pets(unit_of_work)
         embed = discord.Embed(
             colour=discord.Colour.og_blurple(),
             title=f"You earned {amount_earned:.2f} ({job.salary} * {multiplier}) :coin: "
             f"for working as a {job.name.lower()}!",
         ).set_footer(text="You can work a shift again in 15 minutes")
-        await user.unhappy_pets()
         await interaction.response.send_message(embed=embed)
 
     @jobs.command(name="current", description="Shows you your current job")
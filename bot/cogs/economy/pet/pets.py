@@ -5,7 +5,7 @@ from discord import app_commands
 from discord.ext import commands
 
 from bot.bot import Bot
-from bot.economy.economy_objects import EconomyUser, Inventory, ShopItem
+from bot.economy.economy_objects import EconomyUser, InventoryItem
 from bot.economy.pet import Pet
 from bot.economy.shop import name_tag, pet_food
 
@@ -27,15 +27,19 @@ class PetCommands(commands.Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
 
-    async def create_pet(self, item: ShopItem, user_id: int) -> Pet:
-        pet = Pet(item.data["name"], user_id, self.bot, "dog" if item.item_id == "pet_dog" else "cat", item.data["id"])
-        await pet.set_hunger(item.data["hunger"])
-        await pet.set_happy(item.data["happy"])
-        return pet
+    async def create_pet(self, item: InventoryItem, user_id: int) -> Pet:
+        return Pet(
+            item.data["name"],
+            user_id,
+            self.bot,
+            "dog" if item.item_id == "pet_dog" else "cat",
+            item.data["id"],
+            item.data["happy"],
+            item.data["hunger"],
+        )
 
     async def get_user(self, user_id: int) -> EconomyUser:
-        balance = await self.bot.database.economy.get_user_bank(user_id)
-        return EconomyUser(user_id, balance[0], balance[1], Inventory.from_string(balance[2]), self.bot)
+        return await self.bot.economy_users.get(user_id)
 
     async def get_pet(self, interaction: discord.Interaction) -> Pet | None:
         pet = await self.bot.database.pets.get_current_pet(interaction.user.id)
@@ -106,7 +110,8 @@ class PetCommands(commands.Cog):
                 embed=PetEmbed("🏷️ You don't have a name tag! Buy one from the shop.", None),
             )
             return
-        await user.inventory_remove_item(name_tag)
+        async with self.bot.economy_users.lock(interaction.user.id) as (user,):
+            await user.inventory_remove_item(name_tag)
         for item in user.inventory.items:
             if item.item_id.startswith("pet") and item.data["id"] == old:
                 pet = await self.create_pet(item, interaction.user.id)
@@ -137,7 +142,8 @@ class PetCommands(commands.Cog):
                 embed=PetEmbed("You don't have any pet food! Buy one from the shop.", pet),
             )
             return
-        await user.inventory_remove_item(pet_food)
+        async with self.bot.economy_users.lock(interaction.user.id) as (user,):
+            await user.inventory_remove_item(pet_food)
         feed_amount = randint(1, min(5, pet.hunger))  # noqa: S311
         await pet.feed(feed_amount)
         await interaction.response.send_message(embed=PetEmbed(f"You fed your pet {feed_amount} treats!", pet))
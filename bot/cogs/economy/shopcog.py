@@ -1,9 +1,9 @@
+from collections import Counter
+
 import discord
 from discord.ext import commands
 
 from bot.bot import Bot
-from bot.economy.economy_objects import EconomyUser, Inventory
-from bot.economy.pet import generate_pet_id
 from bot.economy.shop import bot_shop
 
 
@@ -29,24 +29,21 @@ class ShopCog(commands.Cog):
         if item is None:
             await interaction.response.send_message("Item not found", ephemeral=True)
             return
-        balance = await self.bot.database.economy.get_user_bank(interaction.user.id)
-        user = EconomyUser(interaction.user.id, balance[0], balance[1], Inventory.from_string(balance[2]), self.bot)
-
-        if user.wallet_balance < item.price * 100:
-            await interaction.response.send_message(
-                "You don't have enough money to buy this item",
-                ephemeral=True,
-            )
-            return
-
+        async with self.bot.economy_users.lock(interaction.user.id) as (user,):
+            if user.wallet_balance < item.price * 100:
+                await interaction.response.send_message(
+                    "You don't have enough money to buy this item",
+                    ephemeral=True,
+                )
+                return
+
+            async with self.bot.database.economy.unit_of_work() as unit_of_work:
+                await user.inventory_add_item(item, unit_of_work)
+                await user.edit_wallet(-item.price * 100, unit_of_work)
         await interaction.response.send_message(
             f"You bought {item.emoji} {item.name} for {item.price} 🪙",
             silent=True,
         )
-        if item.item_id.startswith("pet"):
-            item.data["id"] = generate_pet_id()
-        user.inventory.add_item(item)
-        await user.edit_wallet(-item.price * 100)
 
     @buy_item.autocomplete("item")
     async def item_autocomplete(
@@ -71,26 +68,21 @@ class InventoryCog(commands.Cog):
 
     @inventory.command(name="view", description="view your inventory")
     async def view_inventory(self, interaction: discord.Interaction) -> None:
-        balance = await self.bot.database.economy.get_user_bank(interaction.user.id)
-        user = EconomyUser(interaction.user.id, balance[0], balance[1], Inventory.from_string(balance[2]), self.bot)
+        user = await self.bot.economy_users.get(interaction.user.id)
+        counts = Counter(item.item_id for item in user.inventory.items)  # same snapshot as the items listed
         embed = discord.Embed(
             title=f"{interaction.user.name}'s Inventory",
             colour=discord.Colour.from_rgb(141, 111, 100),
         )
-        items = []
-        counts = {}
+        items = {}  # the first copy of each item
         for item in user.inventory.items:
-            if item.name not in [i.name for i in items]:
-                items.append(item)
-                counts[item.name] = 1
-            else:
-                counts[item.name] += 1
+            items.setdefault(item.item_id, item)
 
-        for item in items:
+        for item in items.values():
             if item.item_id.startswith("pet"):
                 continue
             embed.add_field(
-                name=f"{item.emoji} {item.name} {f'(x{counts[item.name]})' if counts[item.name] > 1 else ''}",
+                name=f"{item.emoji} {item.name} {f'(x{counts[item.item_id]})' if counts[item.item_id] > 1 else ''}",
                 value=f"*{item.description}*{
                     f' ({item.data["duration"]} use(s) left)' if 'duration' in item.data else ''
                 }",
@@ -13,7 +13,12 @@ from discord.app_commands.errors import (
 from discord.ext.commands import Cog
 
 from bot.bot import Bot
-from bot.errors import DatabaseNotConnectedError, JobDoesNotExistError, PetNameTooShortError
+from bot.errors import (
+    DatabaseNotConnectedError,
+    InsufficientFundsError,
+    JobDoesNotExistError,
+    PetNameTooShortError,
+)
 
 
 class ErrorEmbed(Embed):
@@ -94,6 +99,11 @@ class ErrorHandler(Cog):
             embed.internal = False
             embed.set_error("Your pet's name must be at least 1 character long.\n(*Letters and numbers only*)")
 
+        if isinstance(error, InsufficientFundsError):
+            embed.internal = False
+            embed.set_error("There isn't enough money for that anymore, nothing was changed.")
+            embed.set_tip("Check your balance with `/bank balance` and try again.")
+
     async def on_tree_error(
         self,
         interaction: Interaction,
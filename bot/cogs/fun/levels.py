@@ -1,13 +1,17 @@
+import asyncio
 from random import randint
 
+import aiosqlite
 import discord
 from discord import Embed, Interaction, Member, app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 from bot.bot import Bot
 from bot.levels.images.generate import create_level_icon
 from bot.levels.level_system import LEVEL_CAP, LevelUser
 
+LEADERBOARD_PAGE_SIZE = 10
+
 
 class LevelEmbed(Embed):
     def __init__(self, user: LevelUser) -> None:
@@ -15,9 +19,12 @@ class LevelEmbed(Embed):
         self.user = user
         self.add_field(name="Level", value=str(user.level), inline=False)
         self.add_field(name="Total XP", value=str(user.xp), inline=False)
-        self.file = create_level_icon(user.level, user.user_id)
+        self.file: discord.File | None = None
         self.set_thumbnail(url=f"attachment://level_icon_{user.user_id}.png")
 
+    async def set_icon(self) -> None:
+        self.file = await create_level_icon(self.user.level, self.user.user_id)
+
     def set_title(self, title: str) -> None:
         self.title = title
 
@@ -34,13 +41,87 @@ class LevelUpEmbed(Embed):
             title=f"🎉 Congrats on the rankup, {username}! You are now level {user.level}.",
         )
         self.user = user
-        self.file = create_level_icon(user.level, user.user_id)
+        self.file: discord.File | None = None
         self.set_author(icon_url=f"attachment://level_icon_{user.user_id}.png", name="UnseebotV3")
 
+    async def set_icon(self) -> None:
+        self.file = await create_level_icon(self.user.level, self.user.user_id)
+
+
+class LeaderboardView(discord.ui.View):
+    def __init__(self, bot: Bot, guild: discord.Guild, author_id: int) -> None:
+        super().__init__(timeout=180.0)
+        self.bot = bot
+        self.guild = guild
+        self.author_id = author_id
+        self.pages: list[list[tuple[int, int]]] = []  # pages fetched so far, so going back costs nothing
+        self.page = 0
+        self.has_more = False
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author_id
+
+    async def load_next_page(self) -> None:
+        after = self.pages[-1][-1] if self.pages else None
+        # fetch one extra row to know whether there is another page after this one
+        rows = await self.bot.database.levels.get_levels_leaderboard(self.guild.id, LEADERBOARD_PAGE_SIZE + 1, after)
+        self.has_more = len(rows) > LEADERBOARD_PAGE_SIZE
+        self.pages.append(rows[:LEADERBOARD_PAGE_SIZE])
+
+    def build_embed(self) -> discord.Embed:
+        rows = self.pages[self.page]
+        start = self.page * LEADERBOARD_PAGE_SIZE
+        embed = discord.Embed(
+            title=f"🏆  LEADERBOARD - #{start + 1} TO #{start + max(len(rows), 1)}",
+            color=discord.Color.blue(),
+        )
+        for rank, (user_id, xp) in enumerate(rows, start=start + 1):
+            member = self.guild.get_member(user_id)
+            value = f"Level: {LevelUser(user_id, xp, self.guild.id, self.bot).level}\nXP: {xp:,}"
+            if member is not None:
+                embed.add_field(name=f"#{rank} - {member.display_name}", value=value, inline=False)
+            else:  # left the server; mentions don't render in field names, so it goes in the value
+                embed.add_field(name=f"#{rank}", value=f"<@{user_id}>\n{value}", inline=False)
+        if not rows:
+            embed.description = "Nobody has earned any XP yet!"
+        embed.set_thumbnail(url="https://cdn-icons-png.flaticon.com/512/7107/7107530.png")
+        embed.set_footer(text=f"Page {self.page + 1}")
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page == len(self.pages) - 1 and not self.has_more
+        return embed
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.grey, emoji="⬅️")
+    async def previous_page(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        self.page = max(self.page - 1, 0)
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.grey, emoji="➡️")
+    async def next_page(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        if self.page == len(self.pages) - 1:
+            await self.load_next_page()
+        self.page += 1
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
 
 class Levels(commands.Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
+        self.flush_xp.start()
+
+    def cog_unload(self) -> None:
+        self.flush_xp.cancel()
+
+    @tasks.loop(seconds=15)
+    async def flush_xp(self) -> None:
+        try:
+            await self.bot.database.levels.flush_xp()
+        except aiosqlite.Error:  # the XP stays buffered, so the next tick retries instead of stopping the loop
+            self.bot.logger.exception("Couldn't write buffered XP to the database")
+
+    @flush_xp.before_loop
+    async def before_flush_xp(self) -> None:
+        while self.bot.database is None:
+            await asyncio.sleep(1)
 
     levels = app_commands.Group(name="levels", description="Level related commands")
 
@@ -54,7 +135,9 @@ class Levels(commands.Cog):
         lvl_old = user.level
         await user.add_xp(randint(15, 25))  # noqa: S311
         if user.level > lvl_old:
-            await message.reply(embed=LevelUpEmbed(user=user, username=message.author.display_name))
+            embed = LevelUpEmbed(user=user, username=message.author.display_name)
+            await embed.set_icon()
+            await message.reply(embed=embed, file=embed.file)
 
     @levels.command(name="level", description="View your or someone else's level info")
     @app_commands.describe(member="The member to view the level info of")
@@ -63,6 +146,7 @@ class Levels(commands.Cog):
             member = interaction.user
         user = await LevelUser.from_db(member.id, member.guild.id, self.bot)
         embed = LevelEmbed(user)
+        await embed.set_icon()
         await embed.set_ranking()
         embed.set_author(icon_url=member.display_avatar.url, name=member.name)
         await interaction.response.send_message(embed=embed, file=embed.file)
@@ -88,27 +172,16 @@ class Levels(commands.Cog):
         user = await LevelUser.from_db(member.id, member.guild.id, self.bot)
         await user.set_xp(user.requirements[level - 1])
         embed = LevelEmbed(user)
+        await embed.set_icon()
         await embed.set_ranking()
         embed.set_author(icon_url=member.display_avatar.url, name=member.name)
         await interaction.response.send_message(embed=embed, file=embed.file)
 
     @levels.command(name="leaderboard", description="View the level leaderboard")
     async def leaderboard(self, interaction: Interaction) -> None:
-        members = [i for i in interaction.guild.members if not i.bot]
-        member_levels = []
-        for member in members:
-            user = await LevelUser.from_db(member.id, member.guild.id, self.bot)
-            member_levels.append((member, user))
-        member_levels.sort(key=lambda x: x[1].xp, reverse=True)
-        embed = discord.Embed(title="🏆  LEADERBOARD - TOP 10 USERS", color=discord.Color.blue())
-        for i, m in enumerate(member_levels[:10]):
-            embed.add_field(
-                name=f"#{i + 1} - {m[0].display_name}",
-                value=f"Level: {m[1].level}\nXP: {m[1].xp:,}",
-                inline=False,
-            )
-        embed.set_thumbnail(url="https://cdn-icons-png.flaticon.com/512/7107/7107530.png")
-        await interaction.response.send_message(embed=embed)
+        view = LeaderboardView(self.bot, interaction.guild, interaction.user.id)
+        await view.load_next_page()
+        await interaction.response.send_message(embed=view.build_embed(), view=view)
 
 
 async def setup(bot: Bot) -> None:
@@ -1,58 +1,19 @@
 import asyncio
-import contextlib
 import datetime
-import json
-from json import JSONDecodeError
+import time
+from collections.abc import Iterable
 
 import aiohttp
 import discord
-from aiofiles import open as aopen
 from discord import app_commands, utils
 from discord.ext import commands, tasks
 
 from bot.bot import Bot
+from bot.twitch.client import STREAMS_PER_REQUEST, TwitchClient
+from bot.twitch.scheduler import PollScheduler
+from bot.twitch.subscriptions import TwitchSubscription
 
-
-async def get_auth_token(bot: Bot) -> bool:
-    data = {
-        "code": "channel:view:*",
-        "grant_type": "client_credentials",
-        "redirect_uri": "http://localhost",
-        "client_id": bot.settings.twitch_client_id,
-        "client_secret": bot.settings.twitch_secret,
-    }
-    endpoint = "https://id.twitch.tv/oauth2/token"
-
-    async with aiohttp.ClientSession() as session, session.post(endpoint, data=data) as response:
-        authcode = await response.json()
-        authcode = authcode["access_token"]
-
-    await bot.database.update_auth("twitch", authcode)
-
-    return True
-
-
-async def check_live(channel_name: str, bot: Bot) -> None | dict | bool:
-    # get OAUTH2
-    authcode: str = await bot.database.get_auth("twitch")
-    client_id = bot.settings.twitch_client_id
-
-    params = {"user_login": channel_name.lower()}
-    endpoint = "https://api.twitch.tv/helix/streams"
-    async with aiohttp.ClientSession() as session:
-        channel = await session.get(
-            endpoint,
-            headers={"Authorization": "Bearer " + authcode, "Client-Id": client_id},
-            params=params,
-        )
-    data = await channel.json()
-
-    if not data["data"]:
-        return False
-
-    elif data["data"][0]["type"] == "live":  # noqa: RET505
-        return data["data"][0]
-    return None
+POLL_TICK = 5  # seconds between checks for streamers that are due a poll
 
 
 async def create_embed(result: dict) -> discord.Embed:
@@ -90,13 +51,11 @@ async def send_message(  # noqa: PLR0913
     channel: discord.TextChannel,
     message: discord.Message,
     result: dict,
-    ping_role: discord.Role,
+    ping_role: discord.Role | None,
     user: str,
 ) -> None:
-    uid = result["started_at"].replace("-", "/").replace("T", ", ").replace("Z", "")  # unique identifier
-    notif_msg = message.replace("[PING]", f"{ping_role.mention}").replace("[USER]", user)
-    embeds = [msg.embeds async for msg in channel.history(limit=50)]
-    messages = []
+    ping = ping_role.mention if ping_role is not None else ""  # no role set, or it was deleted since
+    notif_msg = message.replace("[PING]", ping).replace("[USER]", user)
     button = discord.ui.Button(
         label="Watch on Twitch",
         url=f"https://twitch.tv/{result['user_login']}",
@@ -104,64 +63,64 @@ async def send_message(  # noqa: PLR0913
     )
     view = discord.ui.View()
     view.add_item(button)
-
-    for i in embeds:
-        with contextlib.suppress(IndexError):
-            messages.append(str(i[0].footer))
-
-    if messages:
-        if f"EmbedProxy(text='stream started at {uid} UTC +0')" in messages:
-            pass
-        else:
-            await channel.send(notif_msg, embed=embed, view=view)
-    else:
-        await channel.send(notif_msg, embed=embed, view=view)
+    await channel.send(notif_msg, embed=embed, view=view)
 
 
 class TwitchStuff(commands.Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
+        self.client = TwitchClient(bot.settings.twitch_client_id, bot.settings.twitch_secret)
+        self.scheduler = PollScheduler()
         self.live_notifs_loop.start()
-        self.update_auth.start()
 
-    def cog_unload(self) -> None:
+    async def cog_unload(self) -> None:
         self.live_notifs_loop.cancel()
-        self.update_auth.cancel()
+        await self.client.close()
 
-    @tasks.loop(seconds=30)
+    @tasks.loop(seconds=POLL_TICK)
     async def live_notifs_loop(self) -> None:
-        async with aopen("streamers.json") as file:
-            content = await file.read()
-            json_file = json.loads(content)
-            await file.close()
-            # Makes sure the json isn't empty before continuing.
-            if json_file is not None:
-                pass
-            else:
-                self.bot.logger.warning("streamers.json file is empty")
-            # iterate over each server
-            for streamer in json_file:
-                if len(streamer) > 0:
-                    output = await check_live(streamer, bot=self.bot)
-                    if output:
-                        embed = await create_embed(result=output)
-                        for guild in json_file[streamer]:
-                            server: discord.Guild = self.bot.get_guild(int(guild["serverID"]))
-                            if server is None:
-                                continue
-                            channel = utils.get(server.text_channels, id=guild["ChannelID"])
-                            await send_message(
-                                embed=embed,
-                                channel=channel,
-                                ping_role=server.get_role(guild["pingroleID"]),
-                                result=output,
-                                message=guild["message"],
-                                user=output["user_name"],
-                            )
-
-    @tasks.loop(seconds=360)
-    async def update_auth(self) -> None:
-        await get_auth_token(self.bot)
+        subscriptions = await self.bot.database.twitch.get_subscriptions()
+        self.scheduler.sync(subscriptions, time.monotonic())
+        due = self.scheduler.due(time.monotonic(), STREAMS_PER_REQUEST)
+        for start in range(0, len(due), STREAMS_PER_REQUEST):
+            if self.client.rate_limited():  # the rest stay due and go first next tick
+                self.bot.logger.warning(
+                    f"Twitch rate limit reached, {len(due) - start} streamers wait until the next poll",  # noqa: G004
+                )
+                return
+            batch = due[start : start + STREAMS_PER_REQUEST]
+            try:
+                live = await self.client.get_streams(batch)
+            except aiohttp.ClientError as error:
+                self.bot.logger.warning(f"Couldn't check which streamers are live: {error}")  # noqa: G004
+                return
+            self.scheduler.polled(batch, live, time.monotonic())
+            for streamer, output in live.items():
+                await self.announce(output, subscriptions.get(streamer, ()))
+
+    async def announce(self, output: dict, subscriptions: Iterable[TwitchSubscription]) -> None:
+        guilds = [
+            subscription
+            for subscription in subscriptions
+            if not self.bot.database.twitch.was_announced(subscription.guild_id, subscription.streamer, output["id"])
+        ]
+        if not guilds:  # already announced everywhere
+            return
+        embed = await create_embed(result=output)
+        for subscription in guilds:
+            server: discord.Guild = self.bot.get_guild(subscription.guild_id)
+            if server is None:
+                continue
+            channel = utils.get(server.text_channels, id=subscription.channel_id)
+            await send_message(
+                embed=embed,
+                channel=channel,
+                ping_role=server.get_role(subscription.role_id),
+                result=output,
+                message=subscription.message,
+                user=output["user_name"],
+            )
+            await self.bot.database.twitch.set_announced(server.id, subscription.streamer, output["id"])
 
     @live_notifs_loop.before_loop
     async def before_live_notifs(self) -> None:
@@ -189,53 +148,26 @@ class TwitchStuff(commands.Cog):
         ping_role: discord.Role,
     ) -> None:
         await interaction.response.defer(ephemeral=True)
-        server_details = {
-            "serverID": interaction.guild_id,
-            "ChannelID": notif_channel.id,
-            "message": message,
-            "pingroleID": ping_role.id,
-        }  # new structure only searches for each streamer once per cycle instead of multiple times
-        async with aopen("streamers.json") as file:
-            try:
-                content = await file.read()
-                json_file = json.loads(content)
-            except JSONDecodeError:
-                json_file = {}
-            for streamer in list(
-                {l.strip() for l in streamer_names.split(",")},  # noqa: E741
-            ):  # if a user puts a streamer more than once we don't want
-                try:  # messages getting sent, so this prevents it.
-                    for srvr in json_file[streamer]:  # replace the data for that server
-                        if srvr["serverID"] == server_details["serverID"]:
-                            json_file[streamer][json_file[streamer].index(srvr)] = server_details
-                        else:
-                            json_file[streamer] = json_file[streamer].append(
-                                server_details,
-                            )  # if streamer already exists just append to the list
-                except KeyError:
-                    json_file[streamer] = [server_details]  # otherwise just make a new list
-        async with aopen("streamers.json", "w") as write_file:
-            json_file = json.dumps(json_file, indent=4)  # makes the json pretty (gives proper formatting)
-            await write_file.write(str(json_file))  # same here
-            await write_file.close()
+        streamers = {name.strip().lower() for name in streamer_names.split(",")} - {""}
+        await self.bot.database.twitch.add_subscriptions(
+            [
+                TwitchSubscription(
+                    streamer=streamer,
+                    guild_id=interaction.guild_id,
+                    channel_id=notif_channel.id,
+                    role_id=ping_role.id,
+                    message=message,
+                )
+                for streamer in streamers
+            ],
+        )
         await interaction.followup.send("Alert/s added successfully!")
 
     @twitch.command(description="clears the live notifications for current server")
     @app_commands.checks.has_permissions(manage_messages=True)
     async def clear_live_notifications(self, interaction: discord.Interaction) -> None:
         await interaction.response.defer(ephemeral=True)
-        async with aopen("streamers.json") as file:
-            content = await file.read()
-            json_file = json.loads(content)
-            for streamer in json_file:
-                for server in json_file[streamer]:
-                    if server["serverID"] == interaction.guild_id:
-                        json_file[streamer].remove(server)
-            await file.close()
-        async with aopen("streamers.json", "w") as write_file:
-            json_file = json.dumps(json_file, indent=4)  # makes the json pretty (gives proper formatting)
-            await write_file.write(str(json_file))  # python uses "'"s in dicts
-            await write_file.close()
+        await self.bot.database.twitch.remove_subscriptions(interaction.guild_id)
         await interaction.followup.send(
             "Alerts removed! Please create a post in the forum of my help server if it did not work. (/server for "
             "invite)",
@@ -245,21 +177,7 @@ class TwitchStuff(commands.Cog):
     @app_commands.checks.has_permissions(manage_messages=True)
     async def remove_live_notification(self, interaction: discord.Interaction, streamer: str) -> None:
         await interaction.response.defer(ephemeral=True)
-        async with aopen("streamers.json") as file:
-            content = await file.read()
-            json_file = json.loads(content)
-            for s in json_file:
-                if s.lower() == streamer.lower():
-                    for server in json_file[s]:
-                        if server["serverID"] == interaction.guild_id:
-                            json_file[s].remove(server)
-            await file.close()
-
-        async with aopen("streamers.json", "w") as write_file:
-            json_file = json.dumps(json_file, indent=4)  # makes the json pretty (gives proper formatting)
-            await write_file.write(str(json_file))  # python uses "'"s in dicts
-
-            await write_file.close()
+        await self.bot.database.twitch.remove_subscriptions(interaction.guild_id, streamer.strip())
         await interaction.followup.send(
             "Alerts removed! Please create a post in the forum of my help server if it did not work. (/server for "
             "invite)",
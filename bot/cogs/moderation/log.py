@@ -5,6 +5,8 @@ from discord.ext.commands import Cog
 
 from bot.bot import Bot
 from bot.database.commands import DatabaseIntegrityError
+from bot.moderation.audit_logs import AuditLogReader
+from bot.moderation.log_sender import LogSender
 
 
 def find_invite_by_code(invite_list: list[discord.Invite], code: str) -> None | discord.Invite:
@@ -46,6 +48,11 @@ class LogEmbed(discord.Embed):
 class Log(commands.Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
+        self.audit_logs = AuditLogReader()
+        self.log_sender = LogSender(bot.logger)
+
+    def cog_unload(self) -> None:
+        self.log_sender.close()
 
         # Role updated (name, permission added/removed)
 
@@ -66,9 +73,13 @@ class Log(commands.Cog):
         if logchannel is None:
             return
         user = ""
-        async for entry in role_after.guild.audit_logs(limit=1, action=discord.AuditLogAction.role_update):
-            if entry.target.id == role_after.id:
-                user = entry.user.mention
+        entry = await self.audit_logs.find(
+            role_after.guild,
+            discord.AuditLogAction.role_update,
+            lambda e: e.target.id == role_after.id,
+        )
+        if entry is not None:
+            user = entry.user.mention
         if role_before.name != role_after.name:  # Check role's name
             embed = discord.Embed(
                 title=":pushpin: Role Name Updated",
@@ -82,7 +93,7 @@ class Log(commands.Cog):
             if user:
                 embed.add_field(name="Updated By:", value=user)
             embed.set_footer(text=f"{role_after.guild.name}")
-            await logchannel.send(embed=embed)
+            self.log_sender.send(logchannel, embed)
         elif role_before.permissions != role_after.permissions:  # Check role's permissions
             diff = set(role_before.permissions).symmetric_difference(set(role_after.permissions))
             permission = next(iter(diff))[0]
@@ -102,7 +113,7 @@ class Log(commands.Cog):
             if user:
                 embed.add_field(name="Updated By:", value=user)
             embed.set_footer(text=role_after.guild.name)
-            await logchannel.send(embed=embed)
+            self.log_sender.send(logchannel, embed)
 
     # Role deleted
     @commands.Cog.listener()
@@ -114,14 +125,18 @@ class Log(commands.Cog):
         if logchannel is None:
             return
         user = ""
-        async for entry in role.guild.audit_logs(limit=1, action=discord.AuditLogAction.role_delete):
-            if entry.target.id == role.id:
-                user = " By " + entry.user.name
+        entry = await self.audit_logs.find(
+            role.guild,
+            discord.AuditLogAction.role_delete,
+            lambda e: e.target.id == role.id,
+        )
+        if entry is not None:
+            user = " By " + entry.user.name
         embed = discord.Embed(color=0x000000, timestamp=discord.utils.utcnow())
         embed.set_author(name=role.guild.name, icon_url=role.guild.icon.url)
         embed.add_field(name=f":pushpin: Role Deleted{user}", value=role)
         embed.set_footer(text=role.guild.name)
-        await logchannel.send(embed=embed)
+        self.log_sender.send(logchannel, embed)
 
     # Role created
     @commands.Cog.listener()
@@ -133,13 +148,18 @@ class Log(commands.Cog):
         if logchannel is None:
             return
         user = ""
-        async for entry in role.guild.audit_logs(limit=1, action=discord.AuditLogAction.role_create):
+        entry = await self.audit_logs.find(
+            role.guild,
+            discord.AuditLogAction.role_create,
+            lambda e: e.target.id == role.id,
+        )
+        if entry is not None:
             user = " By " + entry.user.name
         embed = discord.Embed(color=0x000000, timestamp=discord.utils.utcnow())
         embed.set_author(name=role.guild.name, icon_url=role.guild.icon.url)
         embed.add_field(name=f":pushpin: Role Created{user}", value=role)
         embed.set_footer(text=role.guild.name)
-        await logchannel.send(embed=embed)
+        self.log_sender.send(logchannel, embed)
 
     # Member unbanned
     @commands.Cog.listener()
@@ -151,9 +171,9 @@ class Log(commands.Cog):
         if logchannel is None:
             return
         tuser = ""
-        async for entry in guild.audit_logs(limit=1, action=discord.AuditLogAction.unban):
-            if entry.target.id == user.id:
-                tuser = entry.user.mention
+        entry = await self.audit_logs.find(guild, discord.AuditLogAction.unban, lambda e: e.target.id == user.id)
+        if entry is not None:
+            tuser = entry.user.mention
         embed = discord.Embed(color=0x000000, timestamp=discord.utils.utcnow())
         embed.set_author(name=user.name, icon_url=user.avatar.url)
         embed.add_field(name="⚒️ Member Unbanned", value=user)
@@ -161,7 +181,7 @@ class Log(commands.Cog):
             embed.add_field(name="Action Performed By:", value=tuser)
         embed.set_thumbnail(url=user.avatar.url)
         embed.set_footer(text=guild.name)
-        await logchannel.send(embed=embed)
+        self.log_sender.send(logchannel, embed)
 
     # Member banned
     @commands.Cog.listener()
@@ -173,9 +193,9 @@ class Log(commands.Cog):
         if logchannel is None:
             return
         tuser = ""
-        async for entry in guild.audit_logs(limit=1, action=discord.AuditLogAction.ban):
-            if entry.target.id == user.id:
-                tuser = entry.user.mention
+        entry = await self.audit_logs.find(guild, discord.AuditLogAction.ban, lambda e: e.target.id == user.id)
+        if entry is not None:
+            tuser = entry.user.mention
         embed = discord.Embed(color=0x000000, timestamp=discord.utils.utcnow())
         embed.set_author(name=user.name, icon_url=user.avatar.url)
         embed.add_field(name="⚒️ Member Banned", value=user)
@@ -183,18 +203,32 @@ class Log(commands.Cog):
             embed.add_field(name="Action Performed By:", value=tuser)
         embed.set_thumbnail(url=user.avatar.url)
         embed.set_footer(text=guild.name)
-        await logchannel.send(embed=embed)
+        self.log_sender.send(logchannel, embed)
 
     # Member updated (nickname, role, display avatar, timeout)
     @commands.Cog.listener()
-    async def on_member_update(self, member_before: discord.Member, member_after: discord.Member) -> None:
-        log_channel = await self.bot.database.logs.get_log_channel(member_after.guild.id)
-        if log_channel is None:
+    async def on_member_update(self, member_before: discord.Member, member_after: discord.Member) -> None:  # noqa: C901
+        logchannel_id = await self.bot.database.logs.get_log_channel(member_after.guild.id)
+        if logchannel_id is None:
+            return
+        logchannel = member_after.guild.get_channel(logchannel_id)
+        if logchannel is None:
             return
+        if (
+            member_before.nick == member_after.nick
+            and member_before.roles == member_after.roles
+            and not member_after.is_timed_out()
+            and member_before.display_avatar.url == member_after.display_avatar.url
+        ):
+            return  # nothing we log changed, so don't ask for the audit log either
         user = ""
-        async for entry in member_after.guild.audit_logs(limit=1, action=discord.AuditLogAction.member_update):
-            if entry.target.id == member_after.id:
-                user = " By " + entry.user.name
+        entry = await self.audit_logs.find(
+            member_after.guild,
+            discord.AuditLogAction.member_update,
+            lambda e: e.target.id == member_after.id,
+        )
+        if entry is not None:
+            user = " By " + entry.user.name
         if member_before.nick != member_after.nick:  # Check member's nickname
             embed = discord.Embed(color=0x000000, timestamp=discord.utils.utcnow())
             embed.set_author(name=member_after.name, icon_url=member_after.avatar.url)
@@ -203,8 +237,7 @@ class Log(commands.Cog):
             embed.add_field(name="**New Nickname:**", value=member_after.nick)
             embed.set_thumbnail(url=member_after.avatar.url)
             embed.set_footer(text=member_after.guild.name)
-            channel = self.bot.get_channel(log_channel)
-            await channel.send(embed=embed)
+            self.log_sender.send(logchannel, embed)
         elif member_before.roles != member_after.roles:  # Check member's roles
             diff = (
                 str(set(member_before.roles).symmetric_difference(set(member_after.roles)))
@@ -226,8 +259,7 @@ class Log(commands.Cog):
             )
             embed.set_thumbnail(url=member_after.avatar.url)
             embed.set_footer(text=member_after.guild.name)
-            channel = self.bot.get_channel(log_channel)
-            await channel.send(embed=embed)
+            self.log_sender.send(logchannel, embed)
         elif member_after.is_timed_out():  # Check if member got timeout
             embed = discord.Embed(color=0x000000, timestamp=discord.utils.utcnow())
             embed.set_author(name=member_after.name, icon_url=member_after.avatar.url)
@@ -236,16 +268,14 @@ class Log(commands.Cog):
             embed.add_field(name="Duration", value=f"Timeout ends on {timestamp}")
             embed.set_thumbnail(url=member_after.display_avatar.url)
             embed.set_footer(text=member_after.guild.name)
-            channel = self.bot.get_channel(log_channel)
-            await channel.send(embed=embed)
+            self.log_sender.send(logchannel, embed)
         elif member_before.display_avatar.url != member_after.display_avatar.url:  # Check member's display avatar
             embed = discord.Embed(color=0x000000, timestamp=discord.utils.utcnow())
             embed.set_author(name=member_after.name, icon_url=member_after.avatar.url)
             embed.add_field(name=f":house: Member's Server Avatar Updated{user}", value=member_after)
             embed.set_thumbnail(url=member_after.display_avatar.url)
             embed.set_footer(text=member_after.guild.name)
-            channel = self.bot.get_channel(log_channel)
-            await channel.send(embed=embed)
+            self.log_sender.send(logchannel, embed)
 
     # Message deleted
     @commands.Cog.listener()
@@ -257,11 +287,13 @@ class Log(commands.Cog):
         if logchannel is None:
             return
         deleter = None
-        async for entry in message.guild.audit_logs(limit=1, action=discord.AuditLogAction.message_delete):
-            if entry.extra.channel.id == message.channel.id and entry.target.id == message.author.id:
-                deleter = entry.user
-            else:
-                deleter = message.author
+        entry = await self.audit_logs.find(
+            message.guild,
+            discord.AuditLogAction.message_delete,
+            lambda e: e.extra.channel.id == message.channel.id and e.target.id == message.author.id,
+        )
+        # deleting your own message doesn't create an audit log entry
+        deleter = entry.user if entry is not None else message.author
         embed = discord.Embed(
             description=f"**Message sent by {message.author.mention} deleted in {message.channel.mention}",
             color=0x000000,
@@ -275,7 +307,7 @@ class Log(commands.Cog):
             value=f"- {'\n- '.join([f'[{a.filename}]({a.url})' for a in message.attachments])}",
         )
         embed.set_footer(text=message.guild.name)
-        await logchannel.send(embed=embed)
+        self.log_sender.send(logchannel, embed)
 
     # Message edited
     @commands.Cog.listener()
@@ -311,7 +343,7 @@ class Log(commands.Cog):
             }",
         )
         embed.set_footer(text=message_after.guild.name)
-        await logchannel.send(embed=embed)
+        self.log_sender.send(logchannel, embed)
 
     # Member joined
     @commands.Cog.listener()
@@ -351,7 +383,7 @@ class Log(commands.Cog):
         e.set_thumbnail(url=member.avatar.url)
         e.add_field(name="Age of Account:", value=f"`{member.created_at.strftime(date_format)}`")
         e.set_footer(text=member.guild.name)
-        await logchannel.send(embed=e)
+        self.log_sender.send(logchannel, e)
 
     # Member left
     @commands.Cog.listener()
@@ -375,7 +407,7 @@ class Log(commands.Cog):
         e.add_field(name="Age of Account:", value=f"`{member.created_at.strftime(date_format)}`")
         e.add_field(name="Member from:", value=f"`{member.joined_at.strftime(date_format)}`")
         e.set_footer(text=member.guild.name)
-        await logchannel.send(embed=e)
+        self.log_sender.send(logchannel, e)
 
     @Cog.listener(name="on_guild_channel_create")
     async def channel_create_log(self, channel: discord.abc.GuildChannel) -> None:
@@ -386,11 +418,15 @@ class Log(commands.Cog):
         if logchannel is None:
             return
         creator = "C"
-        async for entry in channel.guild.audit_logs(limit=1, action=discord.AuditLogAction.channel_create):
-            if channel.id == entry.extra.channel.id:
-                creator = entry.user.name + " c"
+        entry = await self.audit_logs.find(
+            channel.guild,
+            discord.AuditLogAction.channel_create,
+            lambda e: e.target.id == channel.id,
+        )
+        if entry is not None:
+            creator = entry.user.name + " c"
         embed = LogEmbed(action=f"{creator}reated {str(channel.type).title()} Channel `{channel.name}`")
-        await logchannel.send(embed=embed)
+        self.log_sender.send(logchannel, embed)
 
     @Cog.listener(name="on_guild_channel_delete")
     async def channel_delete_log(self, channel: discord.abc.GuildChannel) -> None:
@@ -401,12 +437,16 @@ class Log(commands.Cog):
         if logchannel is None:
             return
         deleter = "D"
-        async for entry in channel.guild.audit_logs(limit=1, action=discord.AuditLogAction.channel_delete):
-            if entry.extra.channel.id == channel.id:
-                deleter = entry.user.name + " d"
+        entry = await self.audit_logs.find(
+            channel.guild,
+            discord.AuditLogAction.channel_delete,
+            lambda e: e.target.id == channel.id,
+        )
+        if entry is not None:
+            deleter = entry.user.name + " d"
 
         embed = LogEmbed(action=f"{deleter}eleted {str(channel.type).title()} Channel `{channel.name}`")
-        await logchannel.send(embed=embed)
+        self.log_sender.send(logchannel, embed)
 
     @Cog.listener(name="on_guild_channel_update")
     async def channel_update_log(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel) -> None:
@@ -417,9 +457,13 @@ class Log(commands.Cog):
         if logchannel is None:
             return
         creator = ""
-        async for entry in after.guild.audit_logs(limit=1, action=discord.AuditLogAction.channel_update):
-            if entry.target.id == after.id:
-                creator = entry.user.mention
+        entry = await self.audit_logs.find(
+            after.guild,
+            discord.AuditLogAction.channel_update,
+            lambda e: e.target.id == after.id,
+        )
+        if entry is not None:
+            creator = entry.user.mention
         embed = LogEmbed(
             action=f"Updated {str(after.type).title()} Channel `{after.name}`",
             comparison=True,
@@ -427,7 +471,7 @@ class Log(commands.Cog):
             after=after,
         )
         embed.add_field(name="Updated By:", value=creator)
-        await logchannel.send(embed=embed)
+        self.log_sender.send(logchannel, embed)
 
     # Guild updated (name, icon)
     @commands.Cog.listener()
@@ -439,9 +483,13 @@ class Log(commands.Cog):
         if logchannel is None:
             return
         user = ""
-        async for entry in guild_after.audit_logs(limit=1, action=discord.AuditLogAction.guild_update):
-            if entry.target.id == guild_after.id:
-                user = entry.user.name + " "
+        entry = await self.audit_logs.find(
+            guild_after,
+            discord.AuditLogAction.guild_update,
+            lambda e: e.target.id == guild_after.id,
+        )
+        if entry is not None:
+            user = entry.user.name + " "
         embed = LogEmbed(
             action=f"{user}Updated Server",
         )
@@ -452,7 +500,7 @@ class Log(commands.Cog):
                 name="Icon",
                 value=f"[before]({guild_before.icon.url}) -> [after]({guild_after.icon.url})",
             )
-        await logchannel.send(embed=embed)
+        self.log_sender.send(logchannel, embed)
 
     # Guild emojis updated
     @commands.Cog.listener()
@@ -469,9 +517,9 @@ class Log(commands.Cog):
         if logchannel is None:
             return
         user = ""
-        async for entry in guild.audit_logs(limit=1, action=discord.AuditLogAction.emoji_update):
-            if entry.target.id == guild.id:
-                user = entry.user.name + " "
+        entry = await self.audit_logs.find(guild, discord.AuditLogAction.emoji_update)
+        if entry is not None:
+            user = entry.user.name + " "
         embed = LogEmbed(
             action=f"{user}Updated Server Emojis",
         )
@@ -481,7 +529,7 @@ class Log(commands.Cog):
             embed.add_field(name="Added Emojis", value="\n".join(f"`{emoji.name}`" for emoji in added))
         if removed:
             embed.add_field(name="Removed Emojis", value="\n".join(f"`{emoji.name}`" for emoji in removed))
-        await logchannel.send(embed=embed)
+        self.log_sender.send(logchannel, embed)
 
     # Guild stickers updated
     @commands.Cog.listener()
@@ -498,9 +546,9 @@ class Log(commands.Cog):
         if logchannel is None:
             return
         user = ""
-        async for entry in guild.audit_logs(limit=1, action=discord.AuditLogAction.sticker_update):
-            if entry.target.id == guild.id:
-                user = entry.user.name + " "
+        entry = await self.audit_logs.find(guild, discord.AuditLogAction.sticker_update)
+        if entry is not None:
+            user = entry.user.name + " "
         embed = LogEmbed(
             action=f"{user}Updated Server Stickers",
         )
@@ -510,7 +558,7 @@ class Log(commands.Cog):
             embed.add_field(name="Added Stickers", value="\n".join(f"`{sticker.name}`" for sticker in added))
         if removed:
             embed.add_field(name="Removed Stickers", value="\n".join(f"`{sticker.name}`" for sticker in removed))
-        await logchannel.send(embed=embed)
+        self.log_sender.send(logchannel, embed)
 
     log = app_commands.Group(
         name="modlog",
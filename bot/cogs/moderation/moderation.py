@@ -94,10 +94,11 @@ class Moderation(commands.Cog):
     async def on_message(self, message: discord.Message) -> None:
         if message.guild is None:
             return
-        locked_channels = await self.bot.database.channel_lock.get_locked_channels(message.guild.id)
+        channel_lock = self.bot.database.channel_lock
         if (
-            message.channel.id in locked_channels and message.author.id != self.bot.application_id
-        ) or message.author.id in locked_channels:
+            channel_lock.is_locked(message.channel.id, message.guild.id)
+            and message.author.id != self.bot.application_id
+        ) or channel_lock.is_locked(message.author.id, message.guild.id):
             await message.delete()
 
     @moderation.command(name="purge", description="Purge x messages from a channel")
@@ -127,11 +128,10 @@ class Moderation(commands.Cog):
     @moderation.command(name="lockdown", description="toggle the ability to stop people from speaking in a channel.")
     async def lockdown_toggle(self, interaction: discord.Interaction) -> None:
         await interaction.response.defer(thinking=True)
-        locked_channels = await self.bot.database.channel_lock.get_locked_channels(interaction.guild.id)
         if interaction.guild.owner_id != interaction.user.id:
             await interaction.followup.send(":no_entry_sign: Insufficient Permissions: must be server owner")
             return
-        if interaction.channel.id in locked_channels:
+        if self.bot.database.channel_lock.is_locked(interaction.channel.id, interaction.guild.id):
             await self.bot.database.channel_lock.remove_locked_channel(interaction.channel.id, interaction.guild.id)
             await interaction.followup.send("🔓 Channel Unlocked Successfully!")
         else:
@@ -141,11 +141,10 @@ class Moderation(commands.Cog):
     @moderation.command(name="silence", description="toggle the ability to silence a server member.")
     async def silence_toggle(self, interaction: discord.Interaction, member: discord.Member) -> None:
         await interaction.response.defer(thinking=True)
-        locked_channels = await self.bot.database.channel_lock.get_locked_channels(interaction.guild.id)
         if interaction.guild.owner_id != interaction.user.id:
             await interaction.followup.send(":no_entry_sign: Insufficient Permissions: must be server owner")
             return
-        if member.id in locked_channels:
+        if self.bot.database.channel_lock.is_locked(member.id, interaction.guild.id):
             await self.bot.database.channel_lock.remove_locked_channel(member.id, interaction.guild.id)
             await interaction.followup.send(f"{member.mention}'s voice has been given back.")
             silenced = False
@@ -0,0 +1,84 @@
+"""Compare SQLite write throughput with the default connection and with the pragmas from `Settings`.
+
+Usage:
+    python -m bot.database.benchmark [--writes N]
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import aiosqlite
+
+from bot.database.commands import SqliteRepository
+from bot.database.connection import configure_connection, pragmas_from_settings
+from bot.settings import Settings
+
+XP_BATCH_SIZE = 50  # users per flush in the batched levels benchmark
+
+
+async def _writes_per_second(writes: int, write: Callable[[int], Awaitable[None]]) -> float:
+    start = time.perf_counter()
+    for i in range(writes):
+        await write(i)
+    return writes / (time.perf_counter() - start)
+
+
+async def run_benchmarks(path: Path, pragmas: dict[str, str | int], writes: int) -> dict[str, float]:
+    connection = await aiosqlite.connect(path)
+    await configure_connection(connection, pragmas)
+    database = SqliteRepository(connection)
+    await database.initialize()
+    await database.create_tables()
+
+    async def set_xp(i: int) -> None:
+        await database.levels.set_levels_xp(i, i, 1)
+
+    async def flush_xp(i: int) -> None:
+        for user_id in range(XP_BATCH_SIZE):
+            await database.levels.buffer_levels_xp(i, user_id, 2)
+        await database.levels.flush_xp()
+
+    for user_id in (1, 2):
+        await database.economy.get_user_bank(user_id)  # creates the accounts
+    async with database.economy.unit_of_work() as unit_of_work:
+        unit_of_work.edit_wallet(1, writes)
+
+    async def transfer(_: int) -> None:
+        async with database.economy.unit_of_work() as unit_of_work:
+            unit_of_work.edit_wallet(1, -1)
+            unit_of_work.edit_wallet(2, 1)
+
+    try:
+        return {
+            "levels set_levels_xp": await _writes_per_second(writes, set_xp),
+            f"levels flush_xp ({XP_BATCH_SIZE} users)": await _writes_per_second(writes, flush_xp) * XP_BATCH_SIZE,
+            "economy transfer (2 users)": await _writes_per_second(writes, transfer) * 2,
+        }
+    finally:
+        await connection.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m bot.database.benchmark", description=__doc__)
+    parser.add_argument("--writes", type=int, default=500, help="writes per benchmark")
+    args = parser.parse_args()
+
+    tuned = pragmas_from_settings(Settings.model_construct())  # defaults, without needing the bot's secrets
+    results = {}
+    with TemporaryDirectory() as tmp_dir:
+        for label, pragmas in (("default", {}), ("tuned", tuned)):
+            results[label] = await run_benchmarks(Path(tmp_dir) / f"{label}.db", pragmas, args.writes)
+
+    print(f"tuned pragmas: {tuned}")
+    print(f"{'rows written per second':<36}{'default':>12}{'tuned':>12}{'speedup':>10}")
+    for name, before in results["default"].items():
+        after = results["tuned"][name]
+        print(f"{name:<36}{before:>12,.0f}{after:>12,.0f}{after / before:>9.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
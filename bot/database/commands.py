@@ -1,11 +1,25 @@
+import asyncio
+import uuid
 from ast import literal_eval
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from sqlite3 import DatabaseError
 
 import aiosqlite
 
-from bot.economy.economy_objects import Job
+from bot.database.connection import ReadConnectionPool, transaction
+from bot.economy.codec import decode_inventory, encode_data
+from bot.economy.economy_objects import InventoryItem, Job
 from bot.economy.jobs import get_job_from_str
+from bot.errors import InsufficientFundsError
+from bot.twitch.subscriptions import TwitchSubscription
+
+XP_FLUSH_THRESHOLD = 500  # pending (guild, user) pairs before buffered XP is written early
+XP_CACHE_LIMIT = 50_000  # cached XP totals kept between flushes
+LEVELS_MIGRATION_BATCH_SIZE = 1000
+INVENTORY_MIGRATION_BATCH_SIZE = 500  # bank rows per batch when moving old inventory strings
+BANK_INTEREST_BATCH_SIZE = 1000  # accounts paid per transaction by the daily interest run
 
 
 class DatabaseIntegrityError(Exception):
@@ -17,12 +31,11 @@ class InfractionsRepository:
         self.database = database
 
     async def add_infraction(self, guild_id: int, admin_id: int, user_id: int, description: str) -> None:
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "INSERT INTO infractions (guild, admin_id, user_id, description) VALUES (?, ?, ?, ?)",
                 (guild_id, admin_id, user_id, description),
             )
-            await self.database.commit()
 
     async def get_infraction_count(self, user_id: int, guild_id: int) -> int:
         async with self.database.cursor() as cursor:
@@ -37,79 +50,274 @@ class InfractionsRepository:
 
 
 class LogRepository:
-    def __init__(self, database: aiosqlite.Connection) -> None:
+    def __init__(self, database: aiosqlite.Connection, reader: ReadConnectionPool) -> None:
         self.database = database
+        self.reader = reader
+        # every log listener looks this up, so it is mirrored in memory by `load_log_channels`
+        self._log_channels: dict[int, int] = {}
+
+    async def load_log_channels(self) -> None:
+        async with self.reader.acquire() as connection, connection.cursor() as cursor:
+            await cursor.execute("SELECT guild_id, channel_id FROM log_channels")
+            self._log_channels = dict(await cursor.fetchall())
 
     async def set_log_channel(self, guild_id: int, channel_id: int | None) -> None:
         if channel_id is None:
-            async with self.database.cursor() as cursor:
+            async with transaction(self.database) as cursor:
                 await cursor.execute(
                     "DELETE FROM log_channels WHERE guild_id = ?",
                     (guild_id,),
                 )
-            await self.database.commit()
-            await self.database.commit()
+            self._log_channels.pop(guild_id, None)
             return
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "INSERT OR REPLACE INTO log_channels (guild_id, channel_id) VALUES (?, ?)",
                 (guild_id, channel_id),
             )
-        await self.database.commit()
+        self._log_channels[guild_id] = channel_id
 
     async def get_log_channel(self, guild_id: int) -> int | None:
-        async with self.database.cursor() as cursor:
-            await cursor.execute(
-                "SELECT channel_id FROM log_channels WHERE guild_id = ?",
-                (guild_id,),
-            )
-            result = await cursor.fetchone()
-            if result is None:
-                return None
-            return result[0]
+        return self._log_channels.get(guild_id)
+
+
+class EconomyUnitOfWork:
+    """Balance deltas and inventory changes for any number of users, written by `EconomyRepository.apply`."""
+
+    def __init__(self) -> None:
+        self._balances: dict[int, list[int]] = {}  # user_id -> [wallet delta, bank delta]
+        self._items: dict[tuple[int, str, str], InventoryItem | None] = {}  # None means the item was removed
+
+    def __bool__(self) -> bool:
+        return bool(self._balances or self._items)
+
+    def edit_wallet(self, user_id: int, amount: int) -> None:
+        self._balances.setdefault(user_id, [0, 0])[0] += amount
+
+    def edit_bank(self, user_id: int, amount: int) -> None:
+        self._balances.setdefault(user_id, [0, 0])[1] += amount
+
+    def put_item(self, user_id: int, item: InventoryItem) -> None:
+        # serialized when the unit is applied so later changes to the same item are included
+        self._items[(user_id, item.item_id, item.instance_id)] = item
+
+    def delete_item(self, user_id: int, item: InventoryItem) -> None:
+        self._items[(user_id, item.item_id, item.instance_id)] = None
+
+    def balance_rows(self) -> list[dict[str, int]]:
+        return [
+            {"user_id": user_id, "wallet": wallet, "bank": bank} for user_id, (wallet, bank) in self._balances.items()
+        ]
+
+    def item_rows(self) -> tuple[list[tuple[int, str, str, str]], list[tuple[int, str, str]]]:
+        """Split the item changes into rows to write and keys to delete."""
+        puts, deletes = [], []
+        for key, item in self._items.items():
+            if item is None:
+                deletes.append(key)
+            else:
+                puts.append((*key, encode_data(item.state())))
+        return puts, deletes
+
+
+def _legacy_inventory_rows(user_id: int, blob: str, item_ids: dict[str, str]) -> list[tuple[int, str, str, str]]:
+    """Convert an old `bank.inventory` string into `inventory_items` rows."""
+    rows = []
+    instance_ids = set()
+    for name, _price, _description, item_id, _emoji, data, _instance_id in decode_inventory(blob):
+        # pet food and name tags were saved without an id, so they are matched by name
+        item_id = item_id or item_ids.get(name, name)  # noqa: PLW2901
+        instance_id = uuid.uuid4().hex
+        if item_id.startswith("pet"):
+            # pets keep their id unless another pet already has it, which happened before ids were per pet
+            if data.get("id", "unset") not in {"unset", *instance_ids}:
+                instance_id = data["id"]
+            data["id"] = instance_id
+        instance_ids.add(instance_id)
+        rows.append((user_id, item_id, instance_id, encode_data(data)))
+    return rows
 
 
 class EconomyRepository:
-    def __init__(self, database: aiosqlite.Connection) -> None:
+    def __init__(self, database: aiosqlite.Connection, reader: ReadConnectionPool) -> None:
         self.database = database
+        self.reader = reader
 
-    async def do_bank_interest(self) -> None:
-        async with self.database.cursor() as cursor:
+    async def do_bank_interest(self, run_date: str, batch_size: int = BANK_INTEREST_BATCH_SIZE) -> int:
+        """Pay the daily interest for `run_date`, `batch_size` accounts per transaction.
+
+        Each batch commits together with the run's progress, so a run that was interrupted continues from the last
+        account it paid and a finished run is never paid twice.
+
+        Returns:
+            The number of accounts paid by this call.
+        """
+        async with transaction(self.database) as cursor:
             await cursor.execute(
-                "UPDATE bank SET bank_balance = bank_balance + ROUND(bank_balance / 20, 0)",
+                "INSERT OR IGNORE INTO bank_interest_runs (run_date, last_user_id) VALUES (?, -1)",
+                (run_date,),
             )
-        await self.database.commit()
-
-    async def set_user_bank(self, user_id: int, wallet_balance: int, bank_balance: int, inventory: str) -> None:
+            await cursor.execute(
+                "SELECT last_user_id, finished FROM bank_interest_runs WHERE run_date = ?",
+                (run_date,),
+            )
+            last_user_id, finished = await cursor.fetchone()
+        paid = 0
+        while not finished:
+            async with transaction(self.database) as cursor:
+                # the last account of the next batch, user_id is the rowid so the range is a plain b-tree walk
+                await cursor.execute(
+                    "SELECT MAX(user_id), COUNT(*) FROM (SELECT user_id FROM bank WHERE user_id > ? "
+                    "ORDER BY user_id LIMIT ?)",
+                    (last_user_id, batch_size),
+                )
+                upper, count = await cursor.fetchone()
+                if upper is None:
+                    finished = True
+                    await cursor.execute("UPDATE bank_interest_runs SET finished = 1 WHERE run_date = ?", (run_date,))
+                else:
+                    await cursor.execute(
+                        "UPDATE bank SET bank_balance = bank_balance + ROUND(bank_balance / 20, 0) "
+                        "WHERE user_id > ? AND user_id <= ?",
+                        (last_user_id, upper),
+                    )
+                    await cursor.execute(
+                        "UPDATE bank_interest_runs SET last_user_id = ? WHERE run_date = ?",
+                        (upper, run_date),
+                    )
+                if cursor.rowcount != 1:  # without its progress row the batch could be paid again
+                    raise DatabaseIntegrityError
+            if upper is not None:
+                paid += count
+                last_user_id = upper
+                await asyncio.sleep(0)  # let other writes in between batches
+        return paid
+
+    async def get_unfinished_interest_run(self) -> str | None:
         async with self.database.cursor() as cursor:
             await cursor.execute(
-                "INSERT OR REPLACE INTO bank (user_id, wallet_balance, bank_balance, inventory) VALUES (?, ?, ?, ?)",
-                (user_id, wallet_balance, bank_balance, inventory),
+                "SELECT run_date FROM bank_interest_runs WHERE finished = 0 ORDER BY run_date LIMIT 1",
             )
-        await self.database.commit()
+            result = await cursor.fetchone()
+            return result[0] if result is not None else None
 
-    async def get_user_bank(self, user_id: int) -> tuple[int, int, str]:
-        async with self.database.cursor() as cursor:
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[EconomyUnitOfWork]:
+        """Collect economy changes and write them in a single transaction when the block exits without an error."""
+        unit_of_work = EconomyUnitOfWork()
+        yield unit_of_work
+        await self.apply(unit_of_work)
+
+    async def apply(self, unit_of_work: EconomyUnitOfWork) -> None:
+        """Write a unit of work in one transaction, or nothing at all if any balance would drop below zero.
+
+        Every user with a balance change must already have a bank row, which `get_user_bank` creates.
+
+        Raises:
+            InsufficientFundsError: A wallet or bank balance would have gone negative.
+        """
+        if not unit_of_work:
+            return
+        balances = unit_of_work.balance_rows()
+        puts, deletes = unit_of_work.item_rows()
+        async with transaction(self.database) as cursor:
+            # the guarded balances go first, so a failed guard is rolled back before any item is touched
+            if balances:
+                await cursor.executemany(
+                    """
+                    UPDATE bank SET
+                        wallet_balance = wallet_balance + :wallet,
+                        bank_balance = bank_balance + :bank
+                    WHERE user_id = :user_id AND wallet_balance + :wallet >= 0 AND bank_balance + :bank >= 0
+                    """,
+                    balances,
+                )
+                if cursor.rowcount != len(balances):
+                    raise InsufficientFundsError
+            if puts:
+                await cursor.executemany(
+                    "INSERT OR REPLACE INTO inventory_items (user_id, item_id, instance_id, data) VALUES (?, ?, ?, ?)",
+                    puts,
+                )
+            if deletes:
+                await cursor.executemany(
+                    "DELETE FROM inventory_items WHERE user_id = ? AND item_id = ? AND instance_id = ?",
+                    deletes,
+                )
+
+    async def get_user_bank(self, user_id: int) -> tuple[int, int]:
+        async with self.reader.acquire() as connection, connection.cursor() as cursor:
             await cursor.execute(
-                "SELECT wallet_balance, bank_balance, inventory FROM bank WHERE user_id = ?",
+                "SELECT wallet_balance, bank_balance FROM bank WHERE user_id = ?",
                 (user_id,),
             )
             result = await cursor.fetchone()
-            if result is None:
-                await cursor.execute("INSERT INTO bank (user_id) VALUES (?)", (user_id,))  # create fresh account
-                return 0, 0, "[]"
-            return result
+        if result is None:
+            async with transaction(self.database) as cursor:
+                await cursor.execute("INSERT OR IGNORE INTO bank (user_id) VALUES (?)", (user_id,))  # fresh account
+            return 0, 0
+        return result
+
+    async def get_inventory(self, user_id: int) -> list[tuple[str, str, str]]:
+        async with self.reader.acquire() as connection, connection.cursor() as cursor:
+            await cursor.execute(
+                "SELECT item_id, instance_id, data FROM inventory_items WHERE user_id = ?",
+                (user_id,),
+            )
+            return await cursor.fetchall()
+
+    async def migrate_inventory_blobs(
+        self,
+        item_ids: dict[str, str],
+        batch_size: int = INVENTORY_MIGRATION_BATCH_SIZE,
+    ) -> tuple[int, list[int]]:
+        """Move the old `bank.inventory` strings into `inventory_items`.
+
+        `item_ids` maps item names to ids for items that were saved without one. Each batch of users is moved and
+        their old inventory cleared in the same transaction, so an interrupted migration picks up where it stopped.
+        Inventories that can't be parsed are left alone, so they are tried again on the next start.
+
+        Returns:
+            The number of items moved and the users whose inventory couldn't be parsed.
+        """
+        moved, failed = 0, []
+        last_user_id = -1
+        while True:
+            async with transaction(self.database) as cursor:
+                await cursor.execute(
+                    "SELECT user_id, inventory FROM bank WHERE user_id > ? AND inventory != '[]' "
+                    "ORDER BY user_id LIMIT ?",
+                    (last_user_id, batch_size),
+                )
+                rows = await cursor.fetchall()
+                if not rows:
+                    return moved, failed
+                items, converted = [], []
+                for user_id, blob in rows:
+                    try:
+                        items.extend(_legacy_inventory_rows(user_id, blob, item_ids))
+                    except (ValueError, SyntaxError, IndexError, TypeError):
+                        failed.append(user_id)
+                    else:
+                        converted.append((user_id,))
+                await cursor.executemany(
+                    "INSERT OR IGNORE INTO inventory_items (user_id, item_id, instance_id, data) VALUES (?, ?, ?, ?)",
+                    items,
+                )
+                await cursor.executemany("UPDATE bank SET inventory = '[]' WHERE user_id = ?", converted)
+            moved += len(items)
+            last_user_id = rows[-1][0]
+            await asyncio.sleep(0)  # let the gateway breathe between batches
 
     async def set_job(self, user_id: int, job: Job | None) -> None:
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "INSERT OR REPLACE INTO jobs (user_id, job_name) VALUES (?, ?)",
                 (user_id, job.name),
             )
-        await self.database.commit()
 
     async def get_job(self, user_id: int) -> Job | None:
-        async with self.database.cursor() as cursor:
+        async with self.reader.acquire() as connection, connection.cursor() as cursor:
             await cursor.execute(
                 "SELECT job_name FROM jobs WHERE user_id = ?",
                 (user_id,),
@@ -125,12 +333,11 @@ class StaffRepository:
         self.database = database
 
     async def set_user_strikes(self, user_id: int, strikes: int) -> None:
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "INSERT OR REPLACE INTO staff (user_id, strikes) VALUES (?, ?)",
                 (user_id, strikes),
             )
-        await self.database.commit()
 
     async def get_user_strikes(self, user_id: int) -> int:
         async with self.database.cursor() as cursor:
@@ -145,77 +352,173 @@ class StaffRepository:
 
 
 class LevelsRepository:
-    def __init__(self, database: aiosqlite.Connection) -> None:
+    def __init__(self, database: aiosqlite.Connection, reader: ReadConnectionPool) -> None:
         self.database = database
+        self.reader = reader
+        # XP earned from chat is buffered here and written in batches by `flush_xp`
+        self._pending_xp: dict[tuple[int, int], int] = {}
+        self._xp_cache: dict[tuple[int, int], int] = {}
+        self._flush_lock = asyncio.Lock()
+
+    async def migrate_guild_tables(self, batch_size: int = LEVELS_MIGRATION_BATCH_SIZE) -> int:
+        """Copy the old per-guild `levels_{guild_id}` tables into the shared `levels` table.
+
+        Rows are copied in batches of `batch_size`. Each batch and its progress marker are committed together, so an
+        interrupted migration resumes where it stopped. A legacy table is dropped once it has been copied.
 
-    async def create_guild_levels(self, guild_id: int) -> None:
+        Run it before the bot connects to the gateway. While the bot is online, XP totals and ranks would be read from
+        `levels` before the old rows are copied into it.
+
+        Returns:
+            The number of rows copied.
+        """
         async with self.database.cursor() as cursor:
             await cursor.execute(
-                f"""CREATE TABLE IF NOT EXISTS levels_{guild_id}(
-                    user_id INTEGER PRIMARY KEY,
-                    xp INTEGER DEFAULT 0
-                )""",
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB 'levels_[0-9]*'",
             )
-        await self.database.commit()
-
-    async def add_levels_xp(self, amount: int, user_id: int, db_table: str) -> None:
-        async with self.database.cursor() as cursor:
+            tables = [row[0] for row in await cursor.fetchall()]
+        copied = 0
+        for table in tables:
+            guild_id = int(table.removeprefix("levels_"))
+            async with self.database.cursor() as cursor:
+                await cursor.execute("SELECT last_user_id FROM levels_migration WHERE guild_id = ?", (guild_id,))
+                progress = await cursor.fetchone()
+            last_user_id = progress[0] if progress is not None else -1
+            while True:
+                async with transaction(self.database) as cursor:
+                    await cursor.execute(
+                        f"SELECT user_id, xp FROM {table} WHERE user_id > ? ORDER BY user_id LIMIT ?",  # noqa: S608
+                        (last_user_id, batch_size),
+                    )
+                    rows = await cursor.fetchall()
+                    if not rows:
+                        await cursor.execute(f"DROP TABLE {table}")
+                        await cursor.execute("DELETE FROM levels_migration WHERE guild_id = ?", (guild_id,))
+                        break
+                    # nothing earns XP while this runs, but a user can already have a row if an older build wrote to
+                    # the per-guild table again after a previous migration, so the two totals are added
+                    await cursor.executemany(
+                        "INSERT INTO levels (guild_id, user_id, xp) VALUES (?, ?, ?) "
+                        "ON CONFLICT (guild_id, user_id) DO UPDATE SET xp = xp + excluded.xp",
+                        [(guild_id, user_id, xp) for user_id, xp in rows],
+                    )
+                    last_user_id = rows[-1][0]
+                    await cursor.execute(
+                        "INSERT OR REPLACE INTO levels_migration (guild_id, last_user_id) VALUES (?, ?)",
+                        (guild_id, last_user_id),
+                    )
+                copied += len(rows)
+                await asyncio.sleep(0)  # let the gateway breathe between batches
+        return copied
+
+    async def buffer_levels_xp(self, amount: int, user_id: int, guild_id: int) -> int:
+        """Queue an XP change in memory and return the user's new total.
+
+        The change is written on the next `flush_xp`, which happens on a timer in the levels cog or as soon as
+        `XP_FLUSH_THRESHOLD` users have pending XP.
+        """
+        key = (guild_id, user_id)
+        if key not in self._xp_cache:
+            await self.get_levels_user(user_id, guild_id)  # reads the row into the cache
+        self._xp_cache[key] += amount
+        self._pending_xp[key] = self._pending_xp.get(key, 0) + amount
+        if len(self._pending_xp) >= XP_FLUSH_THRESHOLD:
+            await self.flush_xp()
+        return self._xp_cache[key]
+
+    async def flush_xp(self) -> int:
+        """Write all buffered XP in a single transaction and return the number of rows written."""
+        async with self._flush_lock:
+            if not self._pending_xp:
+                return 0
+            pending, self._pending_xp = self._pending_xp, {}
             try:
-                await cursor.execute(
-                    f"INSERT INTO {db_table} (user_id, xp) VALUES (:user_id, :amount)",  # noqa: S608
-                    {"user_id": user_id, "amount": amount},
-                )
-                await self.database.commit()
+                async with transaction(self.database) as cursor:
+                    await cursor.executemany(
+                        "INSERT INTO levels (guild_id, user_id, xp) VALUES (?, ?, ?) "
+                        "ON CONFLICT (guild_id, user_id) DO UPDATE SET xp = xp + excluded.xp",
+                        [(guild_id, user_id, amount) for (guild_id, user_id), amount in pending.items()],
+                    )
             except DatabaseError:
+                for key, amount in pending.items():  # keep the XP for the next attempt
+                    self._pending_xp[key] = self._pending_xp.get(key, 0) + amount
+                raise
+            if len(self._xp_cache) > XP_CACHE_LIMIT:
+                self._xp_cache = {key: xp for key, xp in self._xp_cache.items() if key in self._pending_xp}
+            return len(pending)
+
+    async def set_levels_xp(self, amount: int, user_id: int, guild_id: int) -> None:
+        async with self._flush_lock:
+            # anything still buffered was earned before the XP was overwritten
+            self._pending_xp.pop((guild_id, user_id), None)
+            self._xp_cache[(guild_id, user_id)] = amount
+            async with transaction(self.database) as cursor:
                 await cursor.execute(
-                    f"UPDATE {db_table} SET xp = xp + :amount WHERE user_id = :user_id",  # noqa: S608
-                    {"amount": amount, "user_id": user_id},
+                    "INSERT OR REPLACE INTO levels (guild_id, user_id, xp) VALUES (?, ?, ?)",
+                    (guild_id, user_id, amount),
                 )
-                await self.database.commit()
 
-    async def set_levels_xp(self, amount: int, user_id: int, db_table: str) -> None:
-        async with self.database.cursor() as cursor:
-            try:
+    async def get_levels_leaderboard(
+        self,
+        guild_id: int,
+        limit: int,
+        after: tuple[int, int] | None = None,
+    ) -> list[tuple[int, int]]:
+        """Return up to `limit` `(user_id, xp)` rows of a guild, highest XP first, read straight off the index.
+
+        Pass the last `(user_id, xp)` row of a page as `after` to get the next page without rescanning the rows before
+        it.
+        """
+        await self.flush_xp()
+        async with self.reader.acquire() as connection, connection.cursor() as cursor:
+            if after is None:
                 await cursor.execute(
-                    f"INSERT INTO {db_table} (user_id, xp) VALUES (:user_id, :amount)",  # noqa: S608
-                    {"user_id": user_id, "amount": amount},
+                    "SELECT user_id, xp FROM levels WHERE guild_id = ? ORDER BY xp DESC, user_id LIMIT ?",
+                    (guild_id, limit),
                 )
-                await self.database.commit()
-            except DatabaseError:
-                await self.create_guild_levels(int("".join([i for i in db_table if i.isnumeric()])))
+            else:
+                last_user_id, last_xp = after
                 await cursor.execute(
-                    f"UPDATE {db_table} SET xp = :amount WHERE user_id = :user_id",  # noqa: S608
-                    {"amount": amount, "user_id": user_id},
+                    "SELECT user_id, xp FROM levels WHERE guild_id = ? AND xp <= ? AND (xp < ? OR user_id > ?) "
+                    "ORDER BY xp DESC, user_id LIMIT ?",
+                    (guild_id, last_xp, last_xp, last_user_id, limit),
                 )
-                await self.database.commit()
+            return list(await cursor.fetchall())
 
-    async def get_guild_levels(self, guild_id: int) -> list[tuple[int, int, int]]:
-        async with self.database.cursor() as cursor:
+    async def get_levels_rank(self, user_id: int, guild_id: int) -> int | None:
+        """Return the 1-based rank of a user in their guild, or None if they have no XP row yet."""
+        await self.flush_xp()
+        async with self.reader.acquire() as connection, connection.cursor() as cursor:
             await cursor.execute(
-                f"SELECT user_id, xp FROM levels_{guild_id}",  # noqa: S608
-            )
-            result = await cursor.fetchall()
-        return [(user_id, xp, guild_id) for user_id, xp in result]
-
-    async def get_levels_user(self, user_id: int, guild_id: int) -> int:
-        async with self.database.cursor() as cursor:
-            try:
-                await cursor.execute(
-                    f"SELECT xp FROM levels_{guild_id} WHERE user_id = :user_id",  # noqa: S608
-                    {"user_id": user_id},
-                )
-                result = await cursor.fetchone()
-            except DatabaseError:
-                await self.create_guild_levels(guild_id)
-                await cursor.execute(
-                    f"SELECT xp FROM levels_{guild_id} WHERE user_id = :user_id",  # noqa: S608
-                    {"user_id": user_id},
+                """
+                SELECT 1 + (
+                    SELECT COUNT(*) FROM levels AS other WHERE other.guild_id = user.guild_id AND other.xp > user.xp
+                ) + (
+                    -- ties are broken by user_id, the same order as `get_levels_leaderboard`
+                    SELECT COUNT(*) FROM levels AS other
+                    WHERE other.guild_id = user.guild_id AND other.xp = user.xp AND other.user_id < user.user_id
                 )
-                result = await cursor.fetchone()
+                FROM levels AS user WHERE user.guild_id = ? AND user.user_id = ?
+                """,
+                (guild_id, user_id),
+            )
+            result = await cursor.fetchone()
         if result is None:
-            return 0
+            return None
         return result[0]
 
+    async def get_levels_user(self, user_id: int, guild_id: int) -> int:
+        if (guild_id, user_id) in self._xp_cache:
+            return self._xp_cache[(guild_id, user_id)]
+        async with self.reader.acquire() as connection, connection.cursor() as cursor:
+            await cursor.execute(
+                "SELECT xp FROM levels WHERE guild_id = ? AND user_id = ?",
+                (guild_id, user_id),
+            )
+            result = await cursor.fetchone()
+        xp = 0 if result is None else result[0]
+        return self._xp_cache.setdefault((guild_id, user_id), xp)  # another message may have cached it meanwhile
+
 
 class ApplicationsRepository:
     def __init__(self, database: aiosqlite.Connection) -> None:
@@ -239,22 +542,20 @@ class ApplicationsRepository:
     ) -> None:
         questions = str(questions)
         role_name = f"{role_name}:{guild_id}"
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "INSERT OR REPLACE INTO application_roles "
                 "(role_name, role_questions, output_channel, role_id) VALUES (?, ?, ?, ?)",
                 (role_name, questions, channel, role_id),
             )
-        await self.database.commit()
 
     async def remove_application_role(self, role_name: str, guild_id: int) -> None:
         role_name = f"{role_name}:{guild_id}"
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "DELETE FROM application_roles WHERE role_name = ?",
                 (role_name,),
             )
-        await self.database.commit()
 
     async def get_application(self, role_name: str, guild_id: int) -> tuple[list, int, int]:
         role_name = f"{role_name}:{guild_id}"
@@ -268,16 +569,15 @@ class ApplicationsRepository:
             return literal_eval(result[0]), result[1], result[2]
 
     async def add_application_user(self, username: str, guild_id: int, role_id: int, role_name: str) -> None:
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "INSERT OR REPLACE INTO current_applications"
                 " (role_name, username, guild, role_id) VALUES (?, ?, ?, ?)",
                 (role_name, username, guild_id, role_id),
             )
-        await self.database.commit()
 
     async def remove_application_user(self, username: str, guild_id: int, app_name: str) -> bool:
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "SELECT COUNT(*) FROM current_applications",
             )
@@ -290,7 +590,6 @@ class ApplicationsRepository:
                 "SELECT COUNT(*) FROM current_applications",
             )
             after = await cursor.fetchone()
-        await self.database.commit()
         return before != after
 
     async def get_application_role(self, guild_id: int, role_name: str, username: str) -> tuple[int]:
@@ -315,20 +614,18 @@ class TicketsRepository:
         self.database = database
 
     async def add_guild_ticket_data(self, guild_id: int, category_id: int) -> None:
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "INSERT OR REPLACE INTO tickets (guild, category) VALUES (?, ?)",
                 (guild_id, category_id),
             )
-        await self.database.commit()
 
     async def add_guild_ticket_count(self, guild_id: int) -> None:
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "UPDATE tickets SET ticket_count = ticket_count + 1 WHERE guild = ?",
                 (guild_id,),
             )
-        await self.database.commit()
 
     async def get_ticket_admins(self, guild_id: int) -> list[int]:
         async with self.database.cursor() as cursor:
@@ -360,25 +657,23 @@ class TicketsRepository:
     async def add_ticket_admin(self, admin_id: int, guild_id: int) -> None:
         current = await self.get_ticket_admins(guild_id=guild_id)
         current.append(admin_id)
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "UPDATE tickets SET admins = ? WHERE guild = ?",
                 (str(current), guild_id),
             )
-        await self.database.commit()
 
     async def remove_ticket_admin(self, admin_id: int, guild_id: int) -> None:
         current = list(set(await self.get_ticket_admins(guild_id=guild_id)))
         current.remove(admin_id)
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "UPDATE tickets SET admins = ? WHERE guild = ?",
                 (str(current), guild_id),
             )
-        await self.database.commit()
 
     async def remove_ticket_data(self, guild_id: int) -> None:
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "DELETE FROM tickets WHERE guild = ?",
                 (guild_id,),
@@ -390,12 +685,11 @@ class PetRepository:
         self.database = database
 
     async def set_current_pet(self, user_id: int, pet_name: str) -> None:
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "INSERT OR REPLACE INTO pets (user_id, pet_name) VALUES (?, ?)",
                 (user_id, pet_name),
             )
-        await self.database.commit()
 
     async def get_current_pet(self, user_id: int) -> str:
         async with self.database.cursor() as cursor:
@@ -410,37 +704,134 @@ class PetRepository:
 
 
 class ChannelLockRepository:
-    def __init__(self, database: aiosqlite.Connection) -> None:
+    def __init__(self, database: aiosqlite.Connection, reader: ReadConnectionPool) -> None:
         self.database = database
+        self.reader = reader
+        # guild id -> locked channel and silenced member ids, mirrored in memory as every message is checked against it
+        self._locked: dict[int, set[int]] = {}
+
+    async def load_locked_channels(self) -> None:
+        async with self.reader.acquire() as connection, connection.cursor() as cursor:
+            await cursor.execute("SELECT channel_id, guild_id FROM locked_channels")
+            locked: dict[int, set[int]] = {}
+            for channel_id, guild_id in await cursor.fetchall():
+                locked.setdefault(guild_id, set()).add(channel_id)
+        self._locked = locked
 
     async def add_locked_channel(self, channel_id: int, guild_id: int) -> None:
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 """
                 INSERT OR REPLACE INTO locked_channels (channel_id, guild_id) VALUES (?, ?)
             """,
                 (channel_id, guild_id),
             )
-            await self.database.commit()
+        self._locked.setdefault(guild_id, set()).add(channel_id)
 
     async def remove_locked_channel(self, channel_id: int, guild_id: int) -> None:
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 """
                 DELETE FROM locked_channels WHERE channel_id = ? AND guild_id = ?
             """,
                 (channel_id, guild_id),
             )
+        locked = self._locked.get(guild_id)
+        if locked is not None:
+            locked.discard(channel_id)
+            if not locked:
+                del self._locked[guild_id]
 
     async def get_locked_channels(self, guild_id: int) -> list[int]:
-        async with self.database.cursor() as cursor:
+        return list(self._locked.get(guild_id, ()))
+
+    def is_locked(self, channel_id: int, guild_id: int) -> bool:
+        """Check a channel or member id against the guild's locks without touching the database."""
+        locked = self._locked.get(guild_id)
+        return locked is not None and channel_id in locked
+
+
+class TwitchRepository:
+    def __init__(self, database: aiosqlite.Connection, reader: ReadConnectionPool) -> None:
+        self.database = database
+        self.reader = reader
+        # (guild id, streamer) -> id of the last stream announced there, checked for every live streamer on each poll
+        self._announced: dict[tuple[int, str], str] = {}
+        # streamer -> subscriptions, read by every poll and dropped whenever the subscriptions change
+        self._subscriptions: dict[str, list[TwitchSubscription]] | None = None
+
+    async def get_subscriptions(self) -> dict[str, list[TwitchSubscription]]:
+        """All subscriptions grouped by lowercase streamer login."""
+        if self._subscriptions is None:
+            async with self.reader.acquire() as connection, connection.cursor() as cursor:
+                await cursor.execute(
+                    "SELECT streamer, guild_id, channel_id, role_id, message FROM twitch_subscriptions",
+                )
+                subscriptions: dict[str, list[TwitchSubscription]] = {}
+                for row in await cursor.fetchall():
+                    subscription = TwitchSubscription(*row)
+                    subscriptions.setdefault(subscription.streamer, []).append(subscription)
+            self._subscriptions = subscriptions
+        return self._subscriptions
+
+    async def add_subscriptions(self, subscriptions: list[TwitchSubscription], *, replace: bool = True) -> int:
+        """Save subscriptions, replacing a guild's existing one for the same streamer unless `replace` is False.
+
+        Returns:
+            The number of subscriptions saved.
+        """
+        async with transaction(self.database) as cursor:
+            await cursor.executemany(
+                f"""
+                INSERT OR {"REPLACE" if replace else "IGNORE"} INTO twitch_subscriptions
+                    (streamer, guild_id, channel_id, role_id, message)
+                VALUES (?, ?, ?, ?, ?)
+                """,  # noqa: S608
+                [(s.streamer.lower(), s.guild_id, s.channel_id, s.role_id, s.message) for s in subscriptions],
+            )
+            saved = cursor.rowcount
+        self._subscriptions = None
+        return saved
+
+    async def remove_subscriptions(self, guild_id: int, streamer: str | None = None) -> int:
+        """Remove a guild's subscription to `streamer`, or all of its subscriptions when `streamer` is None.
+
+        Returns:
+            The number of subscriptions removed.
+        """
+        where, parameters = "guild_id = ?", (guild_id,)
+        if streamer is not None:
+            where, parameters = "guild_id = ? AND streamer = ?", (guild_id, streamer.lower())
+        async with transaction(self.database) as cursor:
+            await cursor.execute(f"DELETE FROM twitch_subscriptions WHERE {where}", parameters)  # noqa: S608
+            removed = cursor.rowcount
+            await cursor.execute(f"DELETE FROM twitch_announcements WHERE {where}", parameters)  # noqa: S608
+        self._subscriptions = None
+        self._announced = {
+            key: stream_id
+            for key, stream_id in self._announced.items()
+            if key[0] != guild_id or (streamer is not None and key[1] != streamer.lower())
+        }
+        return removed
+
+    async def load_announcements(self) -> None:
+        async with self.reader.acquire() as connection, connection.cursor() as cursor:
+            await cursor.execute("SELECT guild_id, streamer, stream_id FROM twitch_announcements")
+            self._announced = {
+                (guild_id, streamer): stream_id for guild_id, streamer, stream_id in await cursor.fetchall()
+            }
+
+    def was_announced(self, guild_id: int, streamer: str, stream_id: str) -> bool:
+        return self._announced.get((guild_id, streamer.lower())) == stream_id
+
+    async def set_announced(self, guild_id: int, streamer: str, stream_id: str) -> None:
+        streamer = streamer.lower()
+        async with transaction(self.database) as cursor:
             await cursor.execute(
-                """
-                SELECT channel_id FROM locked_channels WHERE guild_id = ?
-            """,
-                (guild_id,),
+                "INSERT OR REPLACE INTO twitch_announcements (guild_id, streamer, stream_id) VALUES (?, ?, ?)",
+                (guild_id, streamer, stream_id),
             )
-            return [row[0] for row in await cursor.fetchall()]
+        self._announced[guild_id, streamer] = stream_id
 
 
 @dataclass
@@ -448,6 +839,7 @@ class SqliteRepository:
     """A repository that uses SQLite to store data."""
 
     database: aiosqlite.Connection
+    reader: ReadConnectionPool | None = None
     infractions: InfractionsRepository = None
     logs: LogRepository = None
     tickets: TicketsRepository = None
@@ -457,20 +849,30 @@ class SqliteRepository:
     staff: StaffRepository = None
     pets: PetRepository = None
     channel_lock: ChannelLockRepository = None
+    twitch: TwitchRepository = None
 
     async def initialize(self) -> None:
+        if self.reader is None:  # no separate readers, e.g. an in-memory database
+            self.reader = ReadConnectionPool([self.database], owned=False)
         self.infractions = InfractionsRepository(self.database)
-        self.logs = LogRepository(self.database)
+        self.logs = LogRepository(self.database, self.reader)
         self.tickets = TicketsRepository(self.database)
         self.applications = ApplicationsRepository(self.database)
-        self.levels = LevelsRepository(self.database)
-        self.economy = EconomyRepository(self.database)
+        self.levels = LevelsRepository(self.database, self.reader)
+        self.economy = EconomyRepository(self.database, self.reader)
         self.staff = StaffRepository(self.database)
         self.pets = PetRepository(self.database)
-        self.channel_lock = ChannelLockRepository(self.database)
+        self.channel_lock = ChannelLockRepository(self.database, self.reader)
+        self.twitch = TwitchRepository(self.database, self.reader)
+
+    async def load_caches(self) -> None:
+        """Fill the in-memory mirrors that keep hot event paths off the disk. Call after `create_tables`."""
+        await self.logs.load_log_channels()
+        await self.channel_lock.load_locked_channels()
+        await self.twitch.load_announcements()
 
     async def create_tables(self) -> None:
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 """
                CREATE TABLE IF NOT EXISTS social_media_auth_keys (
@@ -591,6 +993,55 @@ class SqliteRepository:
                 """,
             )
 
+            await cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS levels (
+                    guild_id INTEGER NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    xp INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (guild_id, user_id)
+                ) WITHOUT ROWID
+                """,
+            )
+
+            await cursor.execute(
+                "CREATE INDEX IF NOT EXISTS levels_guild_xp ON levels (guild_id, xp DESC)",
+            )
+
+            await cursor.execute(
+                # progress of copying the old levels_{guild_id} tables into levels
+                """
+                CREATE TABLE IF NOT EXISTS levels_migration (
+                    guild_id INTEGER PRIMARY KEY,
+                    last_user_id INTEGER NOT NULL
+                )
+                """,
+            )
+
+            await cursor.execute(
+                # progress of each day's interest run, so an interrupted run resumes instead of paying twice
+                """
+                CREATE TABLE IF NOT EXISTS bank_interest_runs (
+                    run_date TEXT PRIMARY KEY,
+                    last_user_id INTEGER NOT NULL,
+                    finished INTEGER NOT NULL DEFAULT 0
+                )
+                """,
+            )
+
+            await cursor.execute(
+                # one row per owned item, `data` is the item's JSON state (pet stats, potion uses left, ...)
+                """
+                CREATE TABLE IF NOT EXISTS inventory_items (
+                    user_id INTEGER NOT NULL,
+                    item_id TEXT NOT NULL,
+                    instance_id TEXT NOT NULL,
+                    data TEXT NOT NULL DEFAULT '{}',
+                    PRIMARY KEY (user_id, item_id, instance_id)
+                ) WITHOUT ROWID
+                """,
+            )
+
             await cursor.execute(
                 """
                 CREATE TABLE IF NOT EXISTS locked_channels (
@@ -600,18 +1051,44 @@ class SqliteRepository:
                 """,
             )
 
-        await self.database.commit()
+            await cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS twitch_subscriptions (
+                    streamer TEXT NOT NULL,
+                    guild_id INTEGER NOT NULL,
+                    channel_id INTEGER NOT NULL,
+                    role_id INTEGER,
+                    message TEXT NOT NULL,
+                    PRIMARY KEY (guild_id, streamer)
+                ) WITHOUT ROWID
+                """,
+            )
+
+            await cursor.execute(
+                "CREATE INDEX IF NOT EXISTS twitch_subscriptions_streamer ON twitch_subscriptions (streamer)",
+            )
+
+            await cursor.execute(
+                # the last Twitch stream announced per guild and streamer, so a stream is only announced once
+                """
+                CREATE TABLE IF NOT EXISTS twitch_announcements (
+                    guild_id INTEGER NOT NULL,
+                    streamer TEXT NOT NULL,
+                    stream_id TEXT NOT NULL,
+                    PRIMARY KEY (guild_id, streamer)
+                ) WITHOUT ROWID
+                """,
+            )
 
     async def update_auth(self, platform: str, token: str) -> None:
-        async with self.database.cursor() as cursor:
+        async with transaction(self.database) as cursor:
             await cursor.execute(
                 "INSERT OR REPLACE INTO social_media_auth_keys (platform, token) VALUES (?, ?)",
                 (platform, token),
             )
-        await self.database.commit()
 
     async def get_auth(self, platform: str) -> str | None:
-        async with self.database.cursor() as cursor:
+        async with self.reader.acquire() as connection, connection.cursor() as cursor:
             await cursor.execute(
                 "SELECT token FROM social_media_auth_keys WHERE platform = ? COLLATE NOCASE",
                 (platform,),
@@ -0,0 +1,97 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from weakref import WeakKeyDictionary
+
+import aiosqlite
+
+from bot.settings import Settings
+
+# journal_mode is stored in the database file and synchronous only matters for writes
+READER_PRAGMAS = ("cache_size", "mmap_size", "temp_store", "busy_timeout")
+
+_write_locks: WeakKeyDictionary[aiosqlite.Connection, asyncio.Lock] = WeakKeyDictionary()
+
+
+def pragmas_from_settings(settings: Settings) -> dict[str, str | int]:
+    return {
+        "journal_mode": settings.database_journal_mode,
+        "synchronous": settings.database_synchronous,
+        "cache_size": settings.database_cache_size,
+        "mmap_size": settings.database_mmap_size,
+        "temp_store": settings.database_temp_store,
+        "busy_timeout": settings.database_busy_timeout,
+    }
+
+
+async def configure_connection(connection: aiosqlite.Connection, pragmas: dict[str, str | int]) -> None:
+    # pragma values can't be bound as parameters, they are validated by `Settings` instead
+    for name, value in pragmas.items():
+        async with connection.execute(f"PRAGMA {name} = {value}") as cursor:
+            await cursor.fetchall()
+
+
+async def connect(path: str, settings: Settings) -> aiosqlite.Connection:
+    connection = await aiosqlite.connect(path)
+    await configure_connection(connection, pragmas_from_settings(settings))
+    return connection
+
+
+@asynccontextmanager
+async def transaction(connection: aiosqlite.Connection) -> AsyncIterator[aiosqlite.Cursor]:
+    """Run a write transaction, committing when the block exits and rolling back if it raises.
+
+    Every repository writes through the same connection, where a commit or rollback covers all statements run since
+    the last one, whoever ran them. Transactions on a connection therefore take turns: no other caller's statements,
+    commit or rollback can land in the middle of one. Don't start a transaction inside another, the lock isn't
+    reentrant.
+    """
+    async with _write_locks.setdefault(connection, asyncio.Lock()):
+        try:
+            async with connection.cursor() as cursor:
+                yield cursor
+        except BaseException:
+            await connection.rollback()
+            raise
+        await connection.commit()
+
+
+class ReadConnectionPool:
+    """A small pool of connections that are only used for reads.
+
+    aiosqlite runs each connection on its own thread, so reads taken from the pool run in parallel with each other and
+    with the writer instead of queueing behind it. With WAL enabled, readers always see the last committed write.
+    """
+
+    def __init__(self, connections: list[aiosqlite.Connection], *, owned: bool = True) -> None:
+        self._connections = connections
+        self._owned = owned
+        self._idle: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        for connection in connections:
+            self._idle.put_nowait(connection)
+
+    @classmethod
+    async def open(cls, path: str, settings: Settings) -> "ReadConnectionPool":
+        pragmas = {name: value for name, value in pragmas_from_settings(settings).items() if name in READER_PRAGMAS}
+        pragmas["query_only"] = "on"
+        resolved = await asyncio.to_thread(Path(path).resolve)
+        connections = []
+        for _ in range(settings.database_read_connections):
+            connection = await aiosqlite.connect(f"{resolved.as_uri()}?mode=ro", uri=True)
+            await configure_connection(connection, pragmas)
+            connections.append(connection)
+        return cls(connections)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        connection = await self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put_nowait(connection)
+
+    async def close(self) -> None:
+        if self._owned:
+            for connection in self._connections:
+                await connection.close()
@@ -0,0 +1,70 @@
+"""Compare the legacy inventory strings with the per-item JSON rows that replaced them.
+
+Usage:
+    python -m bot.economy.benchmark [--rounds N]
+"""
+
+import argparse
+import statistics
+import time
+from ast import literal_eval
+from collections.abc import Callable
+
+from bot.economy.codec import ItemTuple, decode_data, encode_data
+from bot.economy.economy_objects import InventoryItem
+from bot.economy.shop import bot_shop
+
+INVENTORY_SIZES = (10, 100, 1000)
+
+
+def _time_us(func: Callable[[], object], rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(samples)
+
+
+def _legacy_decode(text: str) -> list[tuple]:
+    return [literal_eval(item) for item in literal_eval(text)]
+
+
+def _legacy_encode(fields: list[ItemTuple]) -> str:
+    return str([str(item[:-1]) for item in fields])  # the old format had no instance ids
+
+
+def _cases(items: list[InventoryItem]) -> dict[str, tuple[Callable[[], object], Callable[[], object], int]]:
+    """Encode and decode callables, and the encoded size in bytes, for each format."""
+    fields = [(i.name, i.price, i.description, i.item_id, i.emoji, dict(i.data), i.instance_id) for i in items]
+    legacy = _legacy_encode(fields)
+    rows = [encode_data(i.state()) for i in items]
+    return {
+        "legacy": (lambda: _legacy_encode(fields), lambda: _legacy_decode(legacy), len(legacy)),
+        "json rows": (
+            lambda: [encode_data(i.state()) for i in items],
+            lambda: [decode_data(row) for row in rows],
+            sum(map(len, rows)),
+        ),
+    }
+
+
+def benchmark(rounds: int) -> None:
+    print(f"{'items':>6}  {'format':<10}{'encode µs':>12}{'decode µs':>12}{'bytes':>10}")
+    for size in INVENTORY_SIZES:
+        items = [bot_shop.items[i % len(bot_shop.items)].new_instance() for i in range(size)]
+        for name, (encode, decode, size_bytes) in _cases(items).items():
+            encode_us = _time_us(encode, rounds)
+            decode_us = _time_us(decode, rounds)
+            print(f"{size:>6}  {name:<10}{encode_us:>12,.1f}{decode_us:>12,.1f}{size_bytes:>10,}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m bot.economy.benchmark", description=__doc__)
+    parser.add_argument("--rounds", type=int, default=50, help="timed runs per case, the median is reported")
+    args = parser.parse_args()
+    benchmark(args.rounds)
+
+
+if __name__ == "__main__":
+    main()
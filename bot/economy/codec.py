@@ -0,0 +1,29 @@
+"""Encoding for item data and the old inventory strings.
+
+Item data is stored as compact JSON in `inventory_items.data`. Inventories used to be kept whole in `bank.inventory`
+as a repr of a list of `ShopItem.__str__` tuples, which `decode_inventory` still reads for the migration that moves
+them into `inventory_items`.
+"""
+
+import json
+from ast import literal_eval
+from typing import Any
+
+# the fields of an item in `ShopItem` argument order, name first and instance_id last
+ItemTuple = tuple[str, int, str, str, str, dict[str, Any], str]
+
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+_decoder = json.JSONDecoder()
+
+
+def encode_data(data: dict[str, Any]) -> str:
+    return _encoder.encode(data)
+
+
+def decode_data(text: str) -> dict[str, Any]:
+    return _decoder.decode(text)
+
+
+def decode_inventory(text: str) -> list[ItemTuple]:
+    # the old strings have no instance ids, so they are left empty
+    return [(*literal_eval(item), "") for item in literal_eval(text)]
@@ -1,9 +1,17 @@
 import random
-from ast import literal_eval
-from contextlib import suppress
+import uuid
+from collections import ChainMap
+from collections.abc import Iterable
+from contextlib import AbstractAsyncContextManager, nullcontext, suppress
+from typing import TYPE_CHECKING
 
 from discord.ext.commands import Bot
 
+from bot.economy.codec import decode_data
+
+if TYPE_CHECKING:
+    from bot.database.commands import EconomyUnitOfWork
+
 
 class Job:
     def __init__(self, name: str, description: str, salary: int) -> None:
@@ -71,6 +79,12 @@ class ShopItem:
     def item_id(self) -> str:
         return self.__id
 
+    def new_instance(self) -> "InventoryItem":
+        """Create a fresh copy of this item for an inventory."""
+        instance_id = uuid.uuid4().hex
+        state = {"id": instance_id} if "id" in self.data else {}  # pets are looked up by the id in their data
+        return InventoryItem(self, instance_id, state)
+
     @property
     def price(self) -> int:
         return self.__price
@@ -126,41 +140,98 @@ class Shop:
             self.__items.remove(item)
 
 
+class InventoryItem:
+    """One owned copy of a catalogue `ShopItem`.
+
+    Only the state that differs from the catalogue item, like pet stats or potion uses left, belongs to the copy.
+    Reading `data` falls back to the catalogue item's data and writing to it only changes this copy.
+    """
+
+    __slots__ = ("__data", "__item", "__state", "instance_id")
+
+    def __init__(self, item: ShopItem, instance_id: str, state: dict | str | None = None) -> None:
+        self.__item = item
+        self.instance_id = instance_id
+        self.__state = {} if state is None else state  # an undecoded JSON string until `data` is first read
+        self.__data: ChainMap | None = None
+
+    @property
+    def item(self) -> ShopItem:
+        return self.__item
+
+    @property
+    def item_id(self) -> str:
+        return self.__item.item_id
+
+    @property
+    def name(self) -> str:
+        return self.__item.name
+
+    @property
+    def price(self) -> int:
+        return self.__item.price
+
+    @property
+    def description(self) -> str:
+        return self.__item.description
+
+    @property
+    def emoji(self) -> str:
+        return self.__item.emoji
+
+    @property
+    def data(self) -> ChainMap:
+        if self.__data is None:
+            if isinstance(self.__state, str):
+                self.__state = decode_data(self.__state)
+            self.__data = ChainMap(self.__state, self.__item.data)
+        return self.__data
+
+    def state(self) -> dict:
+        """The values of this copy that differ from the catalogue item, which is all that needs saving."""
+        defaults = self.__item.data
+        return {
+            key: value for key, value in self.data.maps[0].items() if key not in defaults or defaults[key] != value
+        }
+
+
 class Inventory:
-    def __init__(self, items: list[ShopItem]) -> None:
+    def __init__(self, items: list[InventoryItem]) -> None:
         self.__items = items
 
-    def __str__(self) -> str:
-        return str([str(i) for i in self.__items])
-
     @classmethod
-    def from_string(cls, string: str) -> "Inventory":
-        items = []
-        for item in literal_eval(string):
-            data = literal_eval(item)
-            items.append(ShopItem(data[0], data[1], data[2], data[3], data[4], data[5]))
-        return cls(items)
+    def from_rows(cls, rows: Iterable[tuple[str, str, str]]) -> "Inventory":
+        """Build an inventory from `(item_id, instance_id, data)` rows of the `inventory_items` table."""
+        from bot.economy.shop import bot_shop  # noqa: PLC0415 - bot.economy.shop imports this module
+
+        catalogue = {item.item_id: item for item in bot_shop.items}
+        return cls(
+            # items that are no longer sold are skipped, there is nothing to show or use them with
+            [
+                InventoryItem(catalogue[item_id], instance_id, state)
+                for item_id, instance_id, state in rows
+                if item_id in catalogue
+            ],
+        )
 
     @property
-    def items(self) -> list[ShopItem]:
+    def items(self) -> list[InventoryItem]:
         return self.__items
 
-    def add_item(self, item: ShopItem) -> None:
+    def add_item(self, item: InventoryItem) -> None:
         self.__items.append(item)
 
-    def remove_item(self, item: ShopItem) -> None:
-        if item.item_id.startswith("pet"):
-            for i in self.__items:
-                if "id" not in i.data:
-                    continue
-                if i.data["id"] == item.data["id"]:
-                    self.__items.remove(i)
-                    break
-            return
+    def remove_item(self, item: ShopItem | InventoryItem) -> InventoryItem | None:
+        """Remove one copy of `item`, or the pet with the same id, and return the copy that was removed."""
         for i in self.__items:
-            if i.name == item.name:
-                self.__items.remove(i)
-                break
+            if item.item_id.startswith("pet"):
+                if "id" not in i.data or i.data["id"] != item.data["id"]:
+                    continue
+            elif i.item_id != item.item_id:
+                continue
+            self.__items.remove(i)
+            return i
+        return None
 
 
 class EconomyUser:
@@ -181,15 +252,20 @@ class EconomyUser:
         self.__bot = bot
         self.__job = job
 
-    async def __update(self) -> None:
-        if self.__job is None:
-            self.__job = await self.__bot.database.economy.get_job(self.__user_id)
-        await self.__bot.database.economy.set_user_bank(
-            self.__user_id,
-            self.__wallet_balance,
-            self.__bank_balance,
-            str(self.__inventory),
-        )
+    @classmethod
+    async def from_db(cls, user_id: int, bot: Bot) -> "EconomyUser":
+        wallet_balance, bank_balance = await bot.database.economy.get_user_bank(user_id)
+        inventory = Inventory.from_rows(await bot.database.economy.get_inventory(user_id))
+        return cls(user_id, wallet_balance, bank_balance, inventory, bot)
+
+    def __unit_of_work(
+        self,
+        unit_of_work: "EconomyUnitOfWork | None",
+    ) -> AbstractAsyncContextManager["EconomyUnitOfWork"]:
+        """Join the caller's unit of work, or write this change on its own when there isn't one."""
+        if unit_of_work is not None:
+            return nullcontext(unit_of_work)
+        return self.__bot.database.economy.unit_of_work()
 
     @property
     def total_balance(self) -> int:
@@ -211,44 +287,72 @@ class EconomyUser:
     def bank_balance(self) -> int:
         return self.__bank_balance
 
-    async def edit_wallet(self, amount: int) -> int:
+    async def edit_wallet(self, amount: int, unit_of_work: "EconomyUnitOfWork | None" = None) -> int:
         self.__wallet_balance += amount
         self.__total_balance += amount
-        await self.__update()
+        async with self.__unit_of_work(unit_of_work) as work:
+            work.edit_wallet(self.__user_id, amount)
         return self.__wallet_balance
 
-    async def edit_bank(self, amount: int) -> int:
+    async def edit_bank(self, amount: int, unit_of_work: "EconomyUnitOfWork | None" = None) -> int:
         self.__bank_balance += amount
         self.__total_balance += amount
-        await self.__update()
+        async with self.__unit_of_work(unit_of_work) as work:
+            work.edit_bank(self.__user_id, amount)
         return self.__bank_balance
 
-    async def inventory_add_item(self, item: ShopItem) -> Inventory:
-        self.__inventory.add_item(item)
-        await self.__update()
+    async def inventory_add_item(self, item: ShopItem, unit_of_work: "EconomyUnitOfWork | None" = None) -> Inventory:
+        instance = item.new_instance()
+        self.__inventory.add_item(instance)
+        async with self.__unit_of_work(unit_of_work) as work:
+            work.put_item(self.__user_id, instance)
         return self.inventory
 
-    async def inventory_remove_item(self, item: ShopItem) -> Inventory:
-        self.__inventory.remove_item(item)
-        await self.__update()
+    async def inventory_remove_item(
+        self,
+        item: ShopItem,
+        unit_of_work: "EconomyUnitOfWork | None" = None,
+    ) -> Inventory:
+        removed = self.__inventory.remove_item(item)
+        if removed is not None:
+            async with self.__unit_of_work(unit_of_work) as work:
+                work.delete_item(self.__user_id, removed)
         return self.inventory
 
-    async def unhappy_pets(self) -> None:
-        """Call this in the work command so pets slowly lose happiness when the user is working"""
-        for item in self.inventory.items:
-            if item.item_id.startswith("pet"):
-                item.data["happy"] -= random.randint(5, 15)  # noqa: S311
-                item.data["happy"] = max(item.data["happy"], 0)
-        await self.__update()
+    async def inventory_update_item(
+        self,
+        item: InventoryItem,
+        unit_of_work: "EconomyUnitOfWork | None" = None,
+    ) -> Inventory:
+        """Save changes to the `data` of an item that is already in this inventory."""
+        async with self.__unit_of_work(unit_of_work) as work:
+            work.put_item(self.__user_id, item)
+        return self.inventory
 
-    async def multiply_earnings(self, amount: float) -> tuple[float, float]:
+    async def unhappy_pets(self, unit_of_work: "EconomyUnitOfWork | None" = None) -> None:
+        """Call this in the work command so pets slowly lose happiness when the user is working"""
+        async with self.__unit_of_work(unit_of_work) as work:
+            for item in self.inventory.items:
+                if item.item_id.startswith("pet"):
+                    item.data["happy"] -= random.randint(5, 15)  # noqa: S311
+                    item.data["happy"] = max(item.data["happy"], 0)
+                    work.put_item(self.__user_id, item)
+
+    async def multiply_earnings(
+        self,
+        amount: float,
+        unit_of_work: "EconomyUnitOfWork | None" = None,
+    ) -> tuple[float, float]:
         multi = 1
-        for item in self.inventory.items:
-            if "multiplier" in item.data:
-                amount *= item.data["multiplier"]
-                multi *= item.data["multiplier"]
-                item.data["duration"] -= 1
-                if item.data["duration"] <= 0:
-                    self.inventory.remove_item(item)
-        await self.__update()
+        async with self.__unit_of_work(unit_of_work) as work:
+            for item in list(self.inventory.items):
+                if "multiplier" in item.data:
+                    amount *= item.data["multiplier"]
+                    multi *= item.data["multiplier"]
+                    item.data["duration"] -= 1
+                    if item.data["duration"] <= 0:
+                        self.inventory.items.remove(item)
+                        work.delete_item(self.__user_id, item)
+                    else:
+                        work.put_item(self.__user_id, item)
         return amount, multi
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+
+from discord.ext.commands import Bot
+
+from bot.economy.economy_objects import EconomyUser
+
+USER_TTL = 300  # seconds a loaded user stays in memory after it was last used
+
+
+class EconomyIdentityMap:
+    """Keeps one `EconomyUser` per user in memory, so repeated commands reuse the state that is already loaded.
+
+    Anything that changes a user should hold their lock from `lock`, which serialises commands for the same user. A
+    user whose changes failed to save is dropped, so the next command loads them again from the database.
+    """
+
+    def __init__(self, bot: Bot, ttl: float = USER_TTL) -> None:
+        self.bot = bot
+        self.ttl = ttl
+        self._users: dict[int, tuple[EconomyUser, float]] = {}  # user_id -> (user, expires at)
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._next_sweep = time.monotonic() + ttl
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    async def get(self, user_id: int) -> EconomyUser:
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._evict_expired(now)
+        cached = self._users.get(user_id)
+        if cached is not None and cached[1] > now:
+            user = cached[0]
+        else:
+            user = await EconomyUser.from_db(user_id, self.bot)
+            # another command may have loaded the same user while we were waiting on the database
+            if user_id in self._users and self._users[user_id][1] > now:
+                user = self._users[user_id][0]
+        self._users[user_id] = (user, now + self.ttl)
+        return user
+
+    @asynccontextmanager
+    async def lock(self, *user_ids: int) -> AsyncIterator[tuple[EconomyUser, ...]]:
+        """Lock the given users and yield them in the same order.
+
+        Locks are always taken in ascending user id order, so two commands locking the same pair can't deadlock.
+        """
+        async with AsyncExitStack() as stack:
+            for user_id in sorted(set(user_ids)):
+                await stack.enter_async_context(self._locks.setdefault(user_id, asyncio.Lock()))
+            try:
+                yield tuple([await self.get(user_id) for user_id in user_ids])
+            except BaseException:
+                for user_id in user_ids:  # the in-memory state may not match what was saved
+                    self._users.pop(user_id, None)
+                raise
+
+    def invalidate(self, user_id: int | None = None) -> None:
+        """Forget one user, or everyone when `user_id` is None, after they were changed outside of this map."""
+        if user_id is None:
+            self._users.clear()
+        else:
+            self._users.pop(user_id, None)
+
+    def _evict_expired(self, now: float) -> None:
+        self._users = {user_id: cached for user_id, cached in self._users.items() if cached[1] > now}
+        self._locks = {
+            user_id: lock for user_id, lock in self._locks.items() if lock.locked() or user_id in self._users
+        }
+        self._next_sweep = now + self.ttl
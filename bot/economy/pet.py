@@ -2,7 +2,7 @@ import uuid
 from typing import Literal
 
 from bot.bot import Bot
-from bot.economy.economy_objects import EconomyUser, Inventory, ShopItem
+from bot.economy.economy_objects import ShopItem
 from bot.errors import PetNameTooShortError
 
 default_pet = {
@@ -24,9 +24,11 @@ class Pet:
         bot: Bot,
         species: Literal["dog", "cat"],
         pet_id: str = "unset",
+        happy: int = 50,
+        hunger: int = 0,
     ) -> None:
-        self.__happy = 50  # percentage
-        self.__hunger = 0  # higher = more hungry
+        self.__happy = happy  # percentage
+        self.__hunger = hunger  # higher = more hungry
         self.__name = name
         self._user_id = owner_id
         self._bot = bot
@@ -54,31 +56,11 @@ class Pet:
         }
 
     async def update(self) -> None:
-        if self._type == "dog":
-            dog.data = self.to_dict()
-            await self._edit_inventory(dog, "edit")
-            dog.data = default_pet
-        elif self._type == "cat":
-            cat.data = self.to_dict()
-            await self._edit_inventory(cat, "edit")
-            cat.data = default_pet
-
-    async def _get_user(self) -> EconomyUser:
-        balance = await self._bot.database.economy.get_user_bank(self._user_id)
-        return EconomyUser(self._user_id, balance[0], balance[1], Inventory.from_string(balance[2]), self._bot)
-
-    async def _edit_inventory(self, item: ShopItem, mode: Literal["edit", "remove"]) -> None:
-        user = await self._get_user()
-        if mode == "remove":
-            await user.inventory_remove_item(item)
-        elif mode == "edit":
-            for i in user.inventory.items:
-                if "id" not in i.data:
-                    continue
-                if i.data["id"] == item.data["id"]:
-                    # prob add an ID to check instead
-                    await user.inventory_remove_item(i)
-                    await user.inventory_add_item(item)
+        async with self._bot.economy_users.lock(self._user_id) as (user,):
+            for item in user.inventory.items:
+                if item.item_id == f"pet_{self._type}" and item.data.get("id") == self.__id:
+                    item.data.update(self.to_dict())
+                    await user.inventory_update_item(item)
                     break
 
     async def feed(self, amount: int) -> None:
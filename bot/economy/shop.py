@@ -14,12 +14,14 @@ pet_food = Item(
     name="Pet food",
     price=50,
     description="Feed your pet some food if it is hungry.",
+    item_id="food",
     emoji="🍴",
 )
 name_tag = Item(
     "Name Tag",
     100,
     "Give your pet with a name with this name tag.",
+    item_id="name_tag",
     emoji="🏷️",
 )
 x2_income_pot = Item(
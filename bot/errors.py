@@ -19,3 +19,7 @@ class PetNameTooShortError(AppCommandError):
 
 class TooManyShopItemsError(AppCommandError):
     """Raised when the shop has too many items."""
+
+
+class InsufficientFundsError(AppCommandError):
+    """Raised when an economy change would leave a wallet or bank balance below zero."""
@@ -0,0 +1,86 @@
+"""Render every level badge into the on-disk cache, or benchmark the PNG encoder settings.
+
+Usage:
+    python -m bot.levels.images render [--workers N]
+    python -m bot.levels.images benchmark [--rounds N]
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from bot.levels.images.generate import (
+    ICON_CACHE_DIR,
+    ICON_LEVELS,
+    draw_level_icon,
+    encode_png,
+    icon_cache_path,
+    prerender_level_icons,
+)
+
+# encoder settings compared by the benchmark
+BENCHMARK_OPTIONS = [
+    {"optimize": False, "compress_level": 1},
+    {"optimize": False, "compress_level": 6},
+    {"optimize": False, "compress_level": 9},
+    {"optimize": True, "compress_level": 9},
+]
+
+
+def _time_ms(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def _summary(samples: list[float]) -> str:
+    p95 = statistics.quantiles(samples, n=20)[-1]
+    return f"mean {statistics.fmean(samples):7.2f} ms  p95 {p95:7.2f} ms"
+
+
+def benchmark(rounds: int) -> None:
+    levels = list(ICON_LEVELS) * rounds
+    render_times = [_time_ms(lambda level=level: draw_level_icon(level)) for level in levels]
+    print(f"render (draw only)          {_summary(render_times)}")
+
+    images = {level: draw_level_icon(level) for level in ICON_LEVELS}
+    with TemporaryDirectory() as tmp_dir:
+        cache_dir = Path(tmp_dir)
+        for options in BENCHMARK_OPTIONS:
+            paths = {level: icon_cache_path(level, options, cache_dir) for level in ICON_LEVELS}
+            sizes = []
+            encode_times = []
+            for level in levels:
+                start = time.perf_counter()
+                png = encode_png(images[level], options)
+                encode_times.append((time.perf_counter() - start) * 1000)
+                sizes.append(len(png))
+                paths[level].write_bytes(png)
+            cached_times = [_time_ms(paths[level].read_bytes) for level in levels]
+            label = f"optimize={options['optimize']!s:<5} level={options['compress_level']}"
+            print(f"encode {label}  {_summary(encode_times)}  avg {statistics.fmean(sizes) / 1024:6.1f} KiB")
+            print(f"cached {label}  {_summary(cached_times)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m bot.levels.images", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    render = commands.add_parser("render", help="render every badge into the on-disk cache")
+    render.add_argument("--workers", type=int, default=None, help="size of the process pool")
+    bench = commands.add_parser("benchmark", help="compare render, encode and cached read latency")
+    bench.add_argument("--rounds", type=int, default=3, help="times each level is rendered")
+    args = parser.parse_args()
+
+    if args.command == "render":
+        start = time.perf_counter()
+        rendered = prerender_level_icons(workers=args.workers)
+        print(f"Rendered {rendered} badge(s) into {ICON_CACHE_DIR} in {time.perf_counter() - start:.2f}s")
+    else:
+        benchmark(args.rounds)
+
+
+if __name__ == "__main__":
+    main()
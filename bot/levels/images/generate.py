@@ -1,13 +1,45 @@
+import asyncio
+import hashlib
 import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from pathlib import Path
 
 from discord import File
 from PIL import Image, ImageDraw, ImageFont
 
+from bot.levels.level_system import LEVEL_CAP
 
-def create_level_icon(level: int, id: int) -> File:
-    img = Image.open("LEVEL.png")
+BASE_IMAGE_PATH = Path("LEVEL.png")
+ICON_CACHE_DIR = Path(".cache/level_icons")
+# Badges are served from the cache, so the slower, smaller encoding is only paid once per badge.
+# Run `python -m bot.levels.images benchmark` before changing these.
+PNG_OPTIONS = {"optimize": False, "compress_level": 9}
+RENDER_VERSION = 1  # bump when the drawing code changes so old cache files are ignored
+ICON_LEVELS = range(-1, LEVEL_CAP + 1)  # -1 is shown past the level cap
+
+# there are only len(ICON_LEVELS) possible badges, so this never needs evicting
+_rendered_icons: dict[int, bytes] = {}
+
+
+@cache
+def _load_assets() -> tuple[Image.Image, ImageFont.FreeTypeFont]:
+    base = Image.open(BASE_IMAGE_PATH)
+    base.load()
+    return base, ImageFont.load_default(100)
+
+
+@cache
+def _base_image_digest() -> bytes:
+    return hashlib.sha256(BASE_IMAGE_PATH.read_bytes()).digest()
+
+
+def draw_level_icon(level: int) -> Image.Image:
+    base, font = _load_assets()
+    img = base.copy()
     draw = ImageDraw.Draw(img)
-    font = ImageFont.load_default(100)
     level = str(level)
     if len(level) == 1:
         pos = (220, 185)
@@ -16,9 +48,75 @@ def create_level_icon(level: int, id: int) -> File:
     else:
         pos = (160, 185)
     draw.text(pos, level, font=font, fill=(0, 75, 39))
+    return img
+
 
+def encode_png(img: Image.Image, options: dict) -> bytes:
     img_buffer = io.BytesIO()
-    img.save(img_buffer, format="PNG")
-    img_buffer.seek(0)
+    img.save(img_buffer, format="PNG", **options)
+    return img_buffer.getvalue()
+
+
+def render_level_icon(level: int, options: dict | None = None) -> bytes:
+    """Draw the level badge and return it encoded as PNG. This is CPU bound, so keep it off the event loop."""
+    return encode_png(draw_level_icon(level), PNG_OPTIONS if options is None else options)
+
+
+def icon_cache_path(level: int, options: dict | None = None, cache_dir: Path = ICON_CACHE_DIR) -> Path:
+    """Return where a badge lives in the on-disk cache.
+
+    The file name is a hash of everything that goes into the image, so a changed base image, drawing code or encoder
+    setting simply misses instead of serving a stale badge.
+    """
+    options = PNG_OPTIONS if options is None else options
+    key = hashlib.sha256(_base_image_digest())
+    key.update(f"{RENDER_VERSION}:{level}:{sorted(options.items())}".encode())
+    return cache_dir / f"{key.hexdigest()}.png"
+
+
+def _write_cache_file(path: Path, png: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(png)
+    tmp_path.replace(path)  # atomic, so a crash never leaves half a PNG behind
+
+
+def load_level_icon(level: int) -> bytes:
+    """Return a badge from the on-disk cache, rendering and storing it on a miss."""
+    path = icon_cache_path(level)
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        png = render_level_icon(level)
+        _write_cache_file(path, png)
+        return png
+
+
+def prerender_level_icons(cache_dir: Path = ICON_CACHE_DIR, workers: int | None = None) -> int:
+    """Fill the on-disk and in-memory caches with every badge, rendering misses in a process pool.
+
+    Returns:
+        The number of badges that had to be rendered.
+    """
+    missing = []
+    for level in ICON_LEVELS:
+        path = icon_cache_path(level, cache_dir=cache_dir)
+        if path.exists():
+            _rendered_icons[level] = path.read_bytes()
+        else:
+            missing.append(level)
+    if missing:
+        # spawn, as forking the bot's threads (aiosqlite, asyncio.to_thread) can deadlock the children
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for level, png in zip(missing, pool.map(render_level_icon, missing), strict=True):
+                _write_cache_file(icon_cache_path(level, cache_dir=cache_dir), png)
+                _rendered_icons[level] = png
+    return len(missing)
+
 
-    return File(img_buffer, filename=f"level_icon_{id}.png")
+async def create_level_icon(level: int, id: int) -> File:
+    png = _rendered_icons.get(level)
+    if png is None:
+        png = await asyncio.to_thread(load_level_icon, level)
+        _rendered_icons[level] = png
+    return File(io.BytesIO(png), filename=f"level_icon_{id}.png")
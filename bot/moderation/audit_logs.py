@@ -0,0 +1,137 @@
+import asyncio
+import datetime
+import time
+from collections import deque
+from collections.abc import Callable
+
+import discord
+
+AUDIT_LOG_BUFFER_SIZE = 25  # newest entries kept per guild, also the page size of each fetch
+AUDIT_LOG_TTL = 5.0  # seconds a guild's buffer is trusted before it is fetched again
+AUDIT_LOG_RETRY_AFTER = 1.0  # refetch on a miss if the buffer is older than this, the entry may not have existed yet
+AUDIT_LOG_EVENT_WINDOW = datetime.timedelta(seconds=1.5)  # how far an entry's creation may be from its event
+# Discord folds repeats of these by the same moderator into the first entry and only bumps `extra.count`
+GROUPED_ACTIONS = frozenset({discord.AuditLogAction.message_delete, discord.AuditLogAction.message_bulk_delete})
+
+
+class AuditLogReader:
+    """Shares recent audit log entries between the log listeners.
+
+    Each guild's newest entries are kept in a small ring buffer. Listeners look up the entry for their event by action
+    and target instead of each requesting `limit=1` themselves, and listeners that fire together wait on the same
+    request.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = AUDIT_LOG_BUFFER_SIZE,
+        ttl: float = AUDIT_LOG_TTL,
+        retry_after: float = AUDIT_LOG_RETRY_AFTER,
+        window: datetime.timedelta = AUDIT_LOG_EVENT_WINDOW,
+    ) -> None:
+        self.buffer_size = buffer_size
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.window = window
+        self._entries: dict[int, deque[discord.AuditLogEntry]] = {}
+        self._fetched_at: dict[int, float] = {}  # when the guild's last finished fetch was sent
+        self._fetches: dict[int, tuple[float, asyncio.Task[None]]] = {}  # fetches in flight and when they were sent
+        # guild id -> grouped entry id -> how much of its `extra.count` has been matched to events already
+        self._claimed: dict[int, dict[int, int]] = {}
+
+    async def find(
+        self,
+        guild: discord.Guild,
+        action: discord.AuditLogAction,
+        check: Callable[[discord.AuditLogEntry], bool] | None = None,
+        at: datetime.datetime | None = None,
+    ) -> discord.AuditLogEntry | None:
+        """Return the newest entry for `action` that passes `check` and belongs to the event at `at`.
+
+        `at` is when the event was received and defaults to now. Entries created more than `window` away from it are
+        from another change, e.g. an earlier edit of the same role, and are ignored. A miss fetches again, joining a
+        fetch that is already running only if it was sent after the event.
+
+        Grouped actions (`GROUPED_ACTIONS`) keep the `created_at` of their first occurrence, so they are matched by
+        their count instead: each increase of `extra.count` since the entry was first seen belongs to one event. As
+        the buffer can't show an increase it hasn't fetched, a miss on them fetches again whenever the buffer is older
+        than the event.
+        """
+        received = time.monotonic()
+        at = at or discord.utils.utcnow()
+        if self._age(guild.id) > self.ttl:
+            await self._refresh(guild, received - self.ttl)
+        entry = self._match(guild.id, action, check, at)
+        stale = action in GROUPED_ACTIONS and self._fetched_at.get(guild.id, float("-inf")) < received
+        if entry is None and (stale or self._age(guild.id) > self.retry_after):
+            await self._refresh(guild, received)
+            entry = self._match(guild.id, action, check, at)
+        return entry
+
+    def forget(self, guild_id: int) -> None:
+        self._entries.pop(guild_id, None)
+        self._fetched_at.pop(guild_id, None)
+        self._claimed.pop(guild_id, None)
+
+    def _age(self, guild_id: int) -> float:
+        return time.monotonic() - self._fetched_at.get(guild_id, float("-inf"))
+
+    def _match(
+        self,
+        guild_id: int,
+        action: discord.AuditLogAction,
+        check: Callable[[discord.AuditLogEntry], bool] | None,
+        at: datetime.datetime,
+    ) -> discord.AuditLogEntry | None:
+        claimed = self._claimed.get(guild_id, {})
+        for entry in self._entries.get(guild_id, ()):  # newest first
+            if entry.action != action or (check is not None and not check(entry)):
+                continue
+            if action not in GROUPED_ACTIONS:
+                if abs(entry.created_at - at) <= self.window:
+                    return entry
+            elif claimed.get(entry.id, 0) < _count(entry):
+                claimed[entry.id] = claimed.get(entry.id, 0) + 1
+                return entry
+        return None
+
+    async def _refresh(self, guild: discord.Guild, since: float) -> None:
+        """Wait for a fetch sent at or after `since`, joining one that is already running when it's recent enough."""
+        while True:
+            started, task = self._fetches.get(guild.id, (None, None))
+            if task is None or task.done():  # a finished fetch may not have been cleared by `_fetch_done` yet
+                started = time.monotonic()
+                task = asyncio.create_task(self._fetch(guild, started))
+                self._fetches[guild.id] = (started, task)
+                task.add_done_callback(lambda done: self._fetch_done(guild.id, done))
+            # shielded so one cancelled listener doesn't cancel the fetch the others are waiting on
+            await asyncio.shield(task)
+            if started >= since:
+                return
+
+    def _fetch_done(self, guild_id: int, task: asyncio.Task[None]) -> None:
+        if self._fetches.get(guild_id, (None, None))[1] is task:
+            del self._fetches[guild_id]
+
+    async def _fetch(self, guild: discord.Guild, started: float) -> None:
+        try:
+            fetched = [entry async for entry in guild.audit_logs(limit=self.buffer_size)]
+        except discord.HTTPException:  # missing View Audit Log permission, or Discord is having a moment
+            fetched = []
+        first_fetch = guild.id not in self._entries
+        # fetched copies replace buffered ones, a grouped entry keeps its id but its count goes up
+        entries = {entry.id: entry for entry in self._entries.get(guild.id, ())}
+        entries.update((entry.id, entry) for entry in fetched)
+        newest = sorted(entries.values(), key=lambda entry: entry.id, reverse=True)[: self.buffer_size]
+        self._entries[guild.id] = deque(newest, maxlen=self.buffer_size)
+        claimed = self._claimed.get(guild.id, {})
+        for entry in fetched:
+            if entry.action in GROUPED_ACTIONS and entry.id not in claimed:
+                # without an earlier fetch to compare with, only the latest occurrence can be the event waiting on it
+                claimed[entry.id] = _count(entry) - 1 if first_fetch else 0
+        self._claimed[guild.id] = {entry.id: claimed[entry.id] for entry in newest if entry.id in claimed}
+        self._fetched_at[guild.id] = max(started, self._fetched_at.get(guild.id, float("-inf")))
+
+
+def _count(entry: discord.AuditLogEntry) -> int:
+    return getattr(entry.extra, "count", None) or 1
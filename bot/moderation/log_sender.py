@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from http import HTTPStatus
+
+import discord
+
+LOG_BATCH_WINDOW = 1.0  # seconds to wait for more embeds after the first one before sending
+LOG_QUEUE_SIZE = 250  # embeds waiting per channel before new ones are dropped
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARACTERS = 6000  # Discord's limit for all embeds of a message combined
+
+
+class LogSender:
+    """Queues log embeds per channel and sends them in batches of up to 10 per message.
+
+    Listeners hand their embed over with `send` and move on. Each channel has one worker that collects embeds for
+    `LOG_BATCH_WINDOW` seconds, so a purge or a raid turns into a handful of messages instead of hundreds. A channel's
+    queue is bounded: when the worker falls behind, new embeds are dropped and counted rather than piling up.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        window: float = LOG_BATCH_WINDOW,
+        queue_size: int = LOG_QUEUE_SIZE,
+    ) -> None:
+        self.logger = logger
+        self.window = window
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._queues: dict[int, asyncio.Queue[discord.Embed]] = {}
+        self._workers: dict[int, asyncio.Task[None]] = {}
+        self._dropped_since_send: dict[int, int] = {}
+
+    def send(self, channel: discord.abc.GuildChannel, embed: discord.Embed) -> bool:
+        """Queue an embed for a log channel. Returns False if the channel's queue was full and it was dropped."""
+        queue = self._queues.get(channel.id)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self.queue_size)
+            self._queues[channel.id] = queue
+            self._workers[channel.id] = asyncio.create_task(self._run(channel, queue))
+        try:
+            queue.put_nowait(embed)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self._dropped_since_send[channel.id] = self._dropped_since_send.get(channel.id, 0) + 1
+            return False
+        return True
+
+    def close(self) -> None:
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
+        self._queues.clear()
+
+    async def _collect(
+        self,
+        queue: asyncio.Queue[discord.Embed],
+        first: discord.Embed,
+    ) -> tuple[list[discord.Embed], discord.Embed | None]:
+        """Gather a batch that starts with `first`. Returns the batch and the embed that didn't fit, if any."""
+        batch = [first]
+        size = len(first)
+        deadline = asyncio.get_running_loop().time() + self.window
+        while len(batch) < MAX_EMBEDS_PER_MESSAGE:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                embed = await asyncio.wait_for(queue.get(), timeout)
+            except TimeoutError:
+                break
+            if size + len(embed) > MAX_EMBED_CHARACTERS:
+                return batch, embed  # starts the next message
+            batch.append(embed)
+            size += len(embed)
+        return batch, None
+
+    async def _send(self, channel: discord.abc.GuildChannel, batch: list[discord.Embed]) -> None:
+        """Send a batch as one message, or one embed per message if Discord rejects the batch as a whole."""
+        try:
+            await channel.send(embeds=batch)
+        except discord.HTTPException as error:
+            if error.status != HTTPStatus.BAD_REQUEST or len(batch) == 1:
+                raise
+            # a single invalid embed fails the whole message, so the others are sent on their own
+            for embed in batch:
+                try:
+                    await channel.send(embed=embed)
+                except discord.HTTPException as embed_error:
+                    if embed_error.status != HTTPStatus.BAD_REQUEST:
+                        raise
+                    self.logger.warning(f"Discord rejected a log embed for {channel.id}: {embed_error.text}")  # noqa: G004
+
+    async def _run(self, channel: discord.abc.GuildChannel, queue: asyncio.Queue[discord.Embed]) -> None:
+        leftover = None
+        while True:
+            first = leftover if leftover is not None else await queue.get()
+            batch, leftover = await self._collect(queue, first)
+            try:
+                # waiting here is the backpressure: discord.py sleeps through the channel's rate limit
+                await self._send(channel, batch)
+            except Exception:  # anything escaping here would stop the channel's worker for good
+                self.logger.exception(f"Failed to send {len(batch)} log embed(s) to {channel.id}")  # noqa: G004
+            if dropped := self._dropped_since_send.pop(channel.id, 0):
+                self.logger.warning(f"Dropped {dropped} log embed(s) for {channel.id}, the queue was full")  # noqa: G004
@@ -1,3 +1,6 @@
+from typing import Literal
+
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -15,11 +18,25 @@ class Settings(BaseSettings):
 
     Attributes:
         discord_bot_token: The Discord bot token taken from the developer portal.
+        database_journal_mode: SQLite `journal_mode` pragma. WAL lets reads run alongside the writer.
+        database_synchronous: SQLite `synchronous` pragma. NORMAL only fsyncs at WAL checkpoints.
+        database_cache_size: SQLite `cache_size` pragma. Negative values are in KiB.
+        database_mmap_size: SQLite `mmap_size` pragma, in bytes.
+        database_temp_store: SQLite `temp_store` pragma.
+        database_busy_timeout: SQLite `busy_timeout` pragma, in milliseconds.
+        database_read_connections: Read-only connections kept open next to the writer, at least one.
     """
 
     model_config = SettingsConfigDict(env_file=".env", env_prefix="UNS_")
 
     discord_bot_token: str
     database_path: str = "game.db"
+    database_journal_mode: Literal["delete", "truncate", "persist", "memory", "wal", "off"] = "wal"
+    database_synchronous: Literal["off", "normal", "full", "extra"] = "normal"
+    database_cache_size: int = -64_000
+    database_mmap_size: int = 256 * 1024 * 1024
+    database_temp_store: Literal["default", "file", "memory"] = "memory"
+    database_busy_timeout: int = 5000
+    database_read_connections: int = Field(4, ge=1)
     twitch_client_id: str
     twitch_secret: str
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from collections.abc import Iterable, Mapping
+from contextlib import suppress
+from http import HTTPStatus
+
+import aiohttp
+
+TOKEN_URL = "https://id.twitch.tv/oauth2/token"  # noqa: S105
+STREAMS_URL = "https://api.twitch.tv/helix/streams"
+STREAMS_PER_REQUEST = 100  # most user_login parameters Helix /streams accepts at once
+REQUEST_TIMEOUT = 10  # seconds
+TOKEN_REFRESH_MARGIN = 300  # seconds before it expires that the app access token is replaced
+RATELIMIT_RESERVE = 10  # Helix requests left unused, for anything else running with the same client id
+
+
+class TwitchClient:
+    """Talks to the Twitch API over one long-lived session.
+
+    The app access token is kept in memory and only replaced shortly before it expires, or when Twitch rejects it.
+    """
+
+    def __init__(self, client_id: str, client_secret: str) -> None:
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token: str | None = None
+        self._token_expires = 0.0  # time.monotonic() the token expires
+        self._token_lock = asyncio.Lock()
+        self.ratelimit_remaining: int | None = None  # from the Helix headers of the last response
+        self.ratelimit_reset = 0.0  # unix time the Helix rate limit bucket refills
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT))
+        return self._session
+
+    async def get_token(self) -> str:
+        """The current app access token, refreshed first if it's about to expire.
+
+        Callers that need a new token at the same time share one refresh.
+        """
+        async with self._token_lock:
+            if self.token is None or time.monotonic() >= self._token_expires - TOKEN_REFRESH_MARGIN:
+                await self._refresh_token()
+            return self.token
+
+    def expire_token(self, token: str) -> None:
+        """Make the next `get_token` fetch a new token, unless `token` was already replaced."""
+        if token == self.token:
+            self._token_expires = 0.0
+
+    async def _refresh_token(self) -> None:
+        data = {
+            "code": "channel:view:*",
+            "grant_type": "client_credentials",
+            "redirect_uri": "http://localhost",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+        }
+        async with self.session.post(TOKEN_URL, data=data) as response:
+            response.raise_for_status()
+            token = await response.json()
+        self.token = token["access_token"]
+        self._token_expires = time.monotonic() + token["expires_in"]
+
+    async def get_streams(self, logins: Iterable[str]) -> dict[str, dict]:
+        """Look up which of `logins` are live, with one request per `STREAMS_PER_REQUEST` logins.
+
+        Returns:
+            The Helix stream objects of the live streams, keyed by lowercase login.
+        """
+        logins = sorted({login.lower() for login in logins if login})
+        streams = {}
+        for start in range(0, len(logins), STREAMS_PER_REQUEST):
+            params = [("user_login", login) for login in logins[start : start + STREAMS_PER_REQUEST]]
+            data = await self._helix_get(STREAMS_URL, params)
+            for stream in data["data"]:
+                if stream["type"] == "live":
+                    streams[stream["user_login"].lower()] = stream
+        return streams
+
+    async def _helix_get(self, url: str, params: list[tuple[str, str]], *, retry: bool = True) -> dict:
+        """GET a Helix endpoint, retrying once with a new token if Twitch rejects the current one."""
+        token = await self.get_token()
+        headers = {"Authorization": f"Bearer {token}", "Client-Id": self.client_id}
+        async with self.session.get(url, headers=headers, params=params) as response:
+            self._update_ratelimit(response.headers)
+            if response.status != HTTPStatus.UNAUTHORIZED or not retry:
+                response.raise_for_status()
+                return await response.json()
+        self.expire_token(token)
+        return await self._helix_get(url, params, retry=False)
+
+    def rate_limited(self) -> bool:
+        """Whether the Helix rate limit is (nearly) used up until `ratelimit_reset`."""
+        return (
+            self.ratelimit_remaining is not None
+            and self.ratelimit_remaining <= RATELIMIT_RESERVE
+            and time.time() < self.ratelimit_reset
+        )
+
+    def _update_ratelimit(self, headers: Mapping[str, str]) -> None:
+        with suppress(KeyError, ValueError):
+            self.ratelimit_remaining = int(headers["Ratelimit-Remaining"])
+            self.ratelimit_reset = float(headers["Ratelimit-Reset"])
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
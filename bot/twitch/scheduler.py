@@ -0,0 +1,69 @@
+import random
+from bisect import bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+MIN_POLL_INTERVAL = 30  # seconds between polls of streamers that are live or were live recently
+MAX_POLL_INTERVAL = 300  # seconds between polls of streamers that have been offline for a long time
+BACKOFF_FACTOR = 0.05  # poll interval as a fraction of how long a streamer has been offline
+
+
+@dataclass(slots=True)
+class _StreamerState:
+    next_poll: float
+    last_live: float  # when the streamer was last seen live, or when we started tracking them
+
+
+class PollScheduler:
+    """Decides which streamers to ask Twitch about next.
+
+    Live and recently live streamers are polled every `min_interval` seconds. Offline streamers back off in proportion
+    to how long they've been offline, up to `max_interval`. New streamers start at a random point of their first
+    interval, so polls are spread out instead of all landing on the same tick. Times are `time.monotonic()` values.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+        backoff: float = BACKOFF_FACTOR,
+    ) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._streamers: dict[str, _StreamerState] = {}
+
+    def __len__(self) -> int:
+        return len(self._streamers)
+
+    def sync(self, streamers: Iterable[str], now: float) -> None:
+        """Start tracking new streamers and forget ones nobody is subscribed to anymore."""
+        streamers = set(streamers)
+        for streamer in self._streamers.keys() - streamers:
+            del self._streamers[streamer]
+        for streamer in streamers - self._streamers.keys():
+            self._streamers[streamer] = _StreamerState(now + random.uniform(0, self.min_interval), now)  # noqa: S311
+
+    def due(self, now: float, batch_size: int) -> list[str]:
+        """Streamers to poll now, soonest first.
+
+        Twitch answers for up to `batch_size` streamers per request, so the last batch is topped up with the streamers
+        that would be due next. Polling them early is free and keeps the number of requests down.
+        """
+        queue = sorted(self._streamers, key=lambda streamer: self._streamers[streamer].next_poll)
+        due = bisect_right(queue, now, key=lambda streamer: self._streamers[streamer].next_poll)
+        if not due:
+            return []
+        return queue[: -(-due // batch_size) * batch_size]
+
+    def polled(self, streamers: Iterable[str], live: Iterable[str], now: float) -> None:
+        """Schedule the next poll of `streamers`, of which `live` are streaming right now."""
+        live = set(live)
+        for streamer in streamers:
+            state = self._streamers.get(streamer)
+            if state is None:  # unsubscribed while the request was running
+                continue
+            if streamer in live:
+                state.last_live = now
+            offline_for = now - state.last_live
+            state.next_poll = now + min(self.max_interval, max(self.min_interval, offline_for * self.backoff))
@@ -0,0 +1,53 @@
+import json
+from json import JSONDecodeError
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from aiofiles import open as aopen
+from aiofiles import os as aos
+
+if TYPE_CHECKING:
+    from bot.database.commands import TwitchRepository
+
+STREAMERS_FILE = Path("streamers.json")  # where subscriptions were kept before they moved into the database
+
+
+class TwitchSubscription(NamedTuple):
+    streamer: str  # lowercase Twitch login
+    guild_id: int
+    channel_id: int
+    role_id: int | None
+    message: str
+
+
+async def import_streamers_json(repository: "TwitchRepository", path: Path = STREAMERS_FILE) -> int:
+    """Copy the subscriptions in the old `streamers.json` into the database.
+
+    The file is renamed to `streamers.json.imported` afterwards, so it's only imported once and alerts removed since
+    don't come back on the next start.
+
+    Returns:
+        The number of subscriptions imported, leaving out ones the database already had.
+    """
+    if not await aos.path.exists(path):
+        return 0
+    async with aopen(path) as file:
+        try:
+            streamers = json.loads(await file.read()) or {}
+        except JSONDecodeError:
+            streamers = {}
+    subscriptions = [
+        TwitchSubscription(
+            streamer=streamer.strip().lower(),
+            guild_id=int(guild["serverID"]),
+            channel_id=int(guild["ChannelID"]),
+            role_id=guild.get("pingroleID"),
+            message=guild["message"],
+        )
+        for streamer, guilds in streamers.items()
+        for guild in guilds or ()  # `add_live_alerts` used to store None here
+        if streamer.strip()
+    ]
+    imported = await repository.add_subscriptions(subscriptions, replace=False)
+    await aos.rename(path, path.with_name(f"{path.name}.imported"))
+    return imported